@@ -1,22 +1,57 @@
-from flask import Flask, request, jsonify, g
+from flask import Flask, request, jsonify, g, Response
 from flask_restful import Api, Resource, abort
+from task_store import TaskStore
 
 app = Flask(__name__)
 api = Api(app)
 
-# Simulación de base de datos en memoria con datos iniciales
-tasks = [
-    {"id": 1, "title": "Comprar leche", "done": False},
-    {"id": 2, "title": "Aprender Flask", "done": True},
-    {"id": 3, "title": "Hacer ejercicio", "done": False}
-]
+# Simulación de base de datos en memoria con datos iniciales.
+# TaskStore guarda las tareas en columnas compactas (ver task_store.py), asigna ids
+# monótonos que nunca se reutilizan y es seguro con un servidor multihilo.
+tasks = TaskStore()
+tasks.add("Comprar leche")
+tasks.add("Aprender Flask", done=True)
+tasks.add("Hacer ejercicio")
 
 def find_task(task_id):
-    return next((task for task in tasks if task["id"] == task_id), None)
+    return tasks.get(task_id)
 
 def validate_task_data(data):
-    if "title" not in data:
+    if not isinstance(data, dict) or "title" not in data:
         abort(400, message="Title is required")
+    validate_title(data)
+
+def validate_title(data):
+    # El título se interna en TaskStore como clave de diccionario: tiene que ser una cadena
+    if "title" in data and not isinstance(data["title"], str):
+        abort(400, message="'title' must be a string")
+
+def parse_bulk_selection(data):
+    """
+    Devuelve (ids, filtro done) para las operaciones en lote.
+    Se indica una lista de ids en el cuerpo ({"ids": [1, 2]}) o un filtro en la query (?done=true).
+    """
+    if not isinstance(data, dict):
+        abort(400, message="The request body must be a JSON object")
+    ids = data.get("ids")
+    done_filter = request.args.get("done")
+    if ids is None and done_filter is None:
+        abort(400, message="Provide a list of 'ids' or a 'done' filter")
+    if ids is not None:
+        # bool es subclase de int: true/false no son ids válidos
+        if not isinstance(ids, list) or not all(
+            isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in ids
+        ):
+            abort(400, message="'ids' must be a list of integers")
+        return ids, None
+    if done_filter.lower() not in ("true", "false"):
+        abort(400, message="'done' filter must be true or false")
+    return None, done_filter.lower() == "true"
+
+def validate_done(data):
+    # "false" (cadena) es verdadero en Python: solo se acepta un booleano JSON
+    if "done" in data and not isinstance(data["done"], bool):
+        abort(400, message="'done' must be true or false")
 
 @app.before_request
 def before_request():
@@ -30,19 +65,42 @@ def after_request(response):
 
 class TaskList(Resource):
     def get(self):
-        return jsonify(tasks)
+        return Response(tasks.to_json(), mimetype="application/json")
     
     def post(self):
         data = request.get_json()
         validate_task_data(data)
-        new_task = {
-            "id": len(tasks) + 1,
-            "title": data.get("title"),
-            "done": False
-        }
-        tasks.append(new_task)
+        new_task = tasks.add(data.get("title"))
         return jsonify(new_task), 201
 
+    def patch(self):
+        """
+        Actualiza varias tareas en una sola petición.
+        PATCH /tasks          Body: {"ids": [1, 2, 3], "done": true}
+        PATCH /tasks?done=false  Body: {"done": true}
+        """
+        data = request.get_json(silent=True) or {}
+        ids, done_filter = parse_bulk_selection(data)
+        if "title" not in data and "done" not in data:
+            abort(400, message="Nothing to update: provide 'title' and/or 'done'")
+        validate_title(data)
+        validate_done(data)
+        updated, not_found = tasks.update_many(
+            ids, where_done=done_filter, title=data.get("title"), done=data.get("done")
+        )
+        return {"updated": updated, "not_found": not_found}, 200
+
+    def delete(self):
+        """
+        Borra varias tareas en una sola petición.
+        DELETE /tasks         Body: {"ids": [1, 2, 3]}
+        DELETE /tasks?done=true  (borra las tareas completadas)
+        """
+        data = request.get_json(silent=True) or {}
+        ids, done_filter = parse_bulk_selection(data)
+        deleted, not_found = tasks.delete_many(ids, where_done=done_filter)
+        return {"deleted": deleted, "not_found": not_found}, 200
+
 class Task(Resource):
     def get(self, task_id):
         task = find_task(task_id)
@@ -51,22 +109,20 @@ class Task(Resource):
         return jsonify(task)
     
     def put(self, task_id):
-        task = find_task(task_id)
-        if task is None:
+        if find_task(task_id) is None:
             abort(404, message="Task not found")
         
         data = request.get_json()
         validate_task_data(data)
-        task["title"] = data.get("title", task["title"])
-        task["done"] = data.get("done", task["done"])
+        validate_done(data)
+        task = tasks.update(task_id, title=data.get("title"), done=data.get("done"))
+        if task is None:
+            abort(404, message="Task not found")
         return jsonify(task)
     
     def delete(self, task_id):
-        global tasks
-        task = find_task(task_id)
-        if task is None:
+        if not tasks.delete(task_id):
             abort(404, message="Task not found")
-        tasks = [task for task in tasks if task["id"] != task_id]
         return {"message": "Task deleted"}, 200
     
 
@@ -74,9 +130,19 @@ class HelloWorld(Resource):
     def get(self):
         return {'message': 'Hola, mundo!'}
 
+class TaskStats(Resource):
+    def get(self):
+        return {"pending": tasks.count_pending(), "done": tasks.count_done()}
+
+class TaskCompleteAll(Resource):
+    def post(self):
+        return {"updated": tasks.mark_all_done()}
+
 api.add_resource(HelloWorld, '/')
 api.add_resource(TaskList, "/tasks")
 api.add_resource(Task, "/tasks/<int:task_id>")
+api.add_resource(TaskStats, "/tasks/stats")
+api.add_resource(TaskCompleteAll, "/tasks/complete-all")
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,286 @@
+import json
+from array import array
+from bisect import bisect_left
+from threading import Lock
+
+class TaskStore:
+    """
+    Almacén de tareas en memoria con representación columnar.
+
+    En lugar de un diccionario por tarea, cada campo vive en su propia columna:
+    - ids: array('q') ordenado de forma ascendente (los ids son monótonos).
+    - títulos: array('I') con referencias a una tabla de cadenas internadas. Cada cadena
+      cuenta cuántas filas vivas la usan y su hueco se libera (y se reutiliza) al llegar a 0.
+    - done / live: bitsets en un bytearray (1 bit por tarea).
+    Una tarea cuesta ~12 bytes más dos bits, frente a los cientos de bytes de un dict.
+    Los borrados marcan la fila como no viva y se compacta cuando hay demasiados huecos.
+    """
+
+    def __init__(self):
+        self._ids = array("q")
+        self._title_refs = array("I")
+        self._done = bytearray()
+        self._live = bytearray()
+        self._titles = []  # Tabla de cadenas internadas (None en los huecos libres)
+        self._title_index = {}  # Cadena -> posición en la tabla
+        self._title_counts = array("I")  # Filas vivas que usan cada cadena
+        self._free_refs = []  # Huecos libres de la tabla de cadenas
+        self._next_id = 1
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return self._size
+
+    # --- Helpers internos (se llaman siempre con el lock adquirido) ---
+
+    @staticmethod
+    def _get_bit(bits, row):
+        return bits[row >> 3] >> (row & 7) & 1
+
+    @staticmethod
+    def _set_bit(bits, row, value):
+        if value:
+            bits[row >> 3] |= 1 << (row & 7)
+        else:
+            bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+    def _intern(self, title):
+        """Devuelve la referencia de la cadena y suma una fila a su contador."""
+        ref = self._title_index.get(title)
+        if ref is None:
+            if self._free_refs:
+                ref = self._free_refs.pop()
+                self._titles[ref] = title
+            else:
+                ref = len(self._titles)
+                self._titles.append(title)
+                self._title_counts.append(0)
+            self._title_index[title] = ref
+        self._title_counts[ref] += 1
+        return ref
+
+    def _release(self, ref):
+        """Resta una fila al contador de la cadena y libera su hueco si ya nadie la usa."""
+        self._title_counts[ref] -= 1
+        if self._title_counts[ref] == 0:
+            del self._title_index[self._titles[ref]]
+            self._titles[ref] = None
+            self._free_refs.append(ref)
+
+    def _retitle(self, row, title):
+        # Primero se interna la nueva: si es la misma cadena, su contador nunca llega a 0
+        ref = self._intern(title)
+        self._release(self._title_refs[row])
+        self._title_refs[row] = ref
+
+    @staticmethod
+    def _mask_rows(mask):
+        """Filas con el bit activo en la máscara (se extrae el bit más bajo cada vez)."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _find_row(self, task_id):
+        # Los ids están ordenados, así que basta una búsqueda binaria
+        row = bisect_left(self._ids, task_id)
+        if row < len(self._ids) and self._ids[row] == task_id and self._get_bit(self._live, row):
+            return row
+        return None
+
+    def _to_dict(self, row):
+        return {
+            "id": self._ids[row],
+            "title": self._titles[self._title_refs[row]],
+            "done": bool(self._get_bit(self._done, row)),
+        }
+
+    def _live_rows(self):
+        live = self._live
+        for row in range(len(self._ids)):
+            if live[row >> 3] >> (row & 7) & 1:
+                yield row
+
+    def _bits_to_int(self, bits):
+        return int.from_bytes(bits, "little")
+
+    def _int_to_bits(self, value, bits):
+        bits[:] = value.to_bytes(len(bits), "little")
+
+    def _select(self, where_done):
+        """Máscara de bits con las filas vivas cuyo done coincide con where_done (None = todas)."""
+        live = self._bits_to_int(self._live)
+        if where_done is None:
+            return live
+        done = self._bits_to_int(self._done)
+        return live & done if where_done else live & ~done
+
+    def _maybe_compact(self):
+        # Compactar cuando más de la mitad de las filas son huecos
+        if len(self._ids) > 64 and self._size < len(self._ids) // 2:
+            self._compact()
+
+    def _compact(self):
+        """Elimina las filas borradas y las cadenas que ya no se referencian."""
+        rows = list(self._live_rows())
+        ids, refs = array("q"), array("I")
+        done, live = bytearray((len(rows) + 7) >> 3), bytearray((len(rows) + 7) >> 3)
+        titles, title_index, title_counts = [], {}, array("I")
+        for new_row, row in enumerate(rows):
+            title = self._titles[self._title_refs[row]]
+            ref = title_index.get(title)
+            if ref is None:
+                ref = len(titles)
+                titles.append(title)
+                title_index[title] = ref
+                title_counts.append(0)
+            title_counts[ref] += 1
+            ids.append(self._ids[row])
+            refs.append(ref)
+            self._set_bit(live, new_row, True)
+            self._set_bit(done, new_row, self._get_bit(self._done, row))
+        self._ids, self._title_refs, self._done, self._live = ids, refs, done, live
+        self._titles, self._title_index = titles, title_index
+        self._title_counts, self._free_refs = title_counts, []
+
+    # --- Operaciones por tarea ---
+
+    def add(self, title, done=False):
+        with self._lock:
+            row = len(self._ids)
+            if row & 7 == 0:
+                self._done.append(0)
+                self._live.append(0)
+            task_id = self._next_id
+            self._next_id += 1
+            self._ids.append(task_id)
+            self._title_refs.append(self._intern(title))
+            self._set_bit(self._live, row, True)
+            self._set_bit(self._done, row, done)
+            self._size += 1
+            return self._to_dict(row)
+
+    def get(self, task_id):
+        with self._lock:
+            row = self._find_row(task_id)
+            return None if row is None else self._to_dict(row)
+
+    def update(self, task_id, title=None, done=None):
+        with self._lock:
+            row = self._find_row(task_id)
+            if row is None:
+                return None
+            if title is not None:
+                self._retitle(row, title)
+            if done is not None:
+                self._set_bit(self._done, row, done)
+            return self._to_dict(row)
+
+    def delete(self, task_id):
+        with self._lock:
+            row = self._find_row(task_id)
+            if row is None:
+                return False
+            self._set_bit(self._live, row, False)
+            self._release(self._title_refs[row])
+            self._size -= 1
+            self._maybe_compact()
+            return True
+
+    # --- Operaciones en lote (una sola adquisición del lock) ---
+
+    def update_many(self, task_ids=None, where_done=None, title=None, done=None):
+        """
+        Actualiza las tareas indicadas por task_ids o, si no se pasan, las que cumplan
+        el filtro where_done. Devuelve (número de tareas actualizadas, ids no encontrados).
+        """
+        with self._lock:
+            if task_ids is None:
+                selected = self._select(where_done)
+                if title is not None:
+                    # Las referencias de título son un array por fila: se recorren solo los bits
+                    # activos de la máscara en lugar de todas las filas
+                    for row in self._mask_rows(selected):
+                        self._retitle(row, title)
+                if done is not None:
+                    current = self._bits_to_int(self._done)
+                    self._int_to_bits(current | selected if done else current & ~selected, self._done)
+                return selected.bit_count(), []
+
+            updated, missing = 0, []
+            for task_id in task_ids:
+                row = self._find_row(task_id)
+                if row is None:
+                    missing.append(task_id)
+                    continue
+                if title is not None:
+                    self._retitle(row, title)
+                if done is not None:
+                    self._set_bit(self._done, row, done)
+                updated += 1
+            return updated, missing
+
+    def delete_many(self, task_ids=None, where_done=None):
+        """
+        Borra las tareas indicadas por task_ids o, si no se pasan, las que cumplan
+        el filtro where_done. Devuelve (número de tareas borradas, ids no encontrados).
+        """
+        with self._lock:
+            if task_ids is None:
+                selected = self._select(where_done)
+                self._int_to_bits(self._bits_to_int(self._live) & ~selected, self._live)
+                for row in self._mask_rows(selected):
+                    self._release(self._title_refs[row])
+                deleted, missing = selected.bit_count(), []
+            else:
+                deleted, missing = 0, []
+                for task_id in task_ids:
+                    row = self._find_row(task_id)
+                    if row is None:
+                        missing.append(task_id)
+                        continue
+                    self._set_bit(self._live, row, False)
+                    self._release(self._title_refs[row])
+                    deleted += 1
+            self._size -= deleted
+            self._maybe_compact()
+            return deleted, missing
+
+    # --- Operaciones vectorizadas sobre las columnas ---
+
+    def mark_all_done(self):
+        """Marca todas las tareas como completadas y devuelve cuántas cambiaron."""
+        with self._lock:
+            changed = self._count_pending()
+            self._done[:] = b"\xff" * len(self._done)
+            return changed
+
+    def _count_pending(self):
+        return self._select(False).bit_count()
+
+    def count_pending(self):
+        with self._lock:
+            return self._count_pending()
+
+    def count_done(self):
+        with self._lock:
+            return self._size - self._count_pending()
+
+    def to_json(self):
+        """Serializa directamente desde las columnas, sin crear un dict por tarea."""
+        with self._lock:
+            ids, refs, titles, done = self._ids, self._title_refs, self._titles, self._done
+            # Cada título se codifica una sola vez aunque se repita en muchas tareas
+            encoded = {}
+            parts = []
+            for row in self._live_rows():
+                ref = refs[row]
+                title = encoded.get(ref)
+                if title is None:
+                    title = encoded[ref] = json.dumps(titles[ref])
+                parts.append(
+                    '{"id":%d,"title":%s,"done":%s}'
+                    % (ids[row], title, "true" if done[row >> 3] >> (row & 7) & 1 else "false")
+                )
+            return "[" + ",".join(parts) + "]"
@@ -0,0 +1,46 @@
+from collections import Counter
+from task_store import TaskStore
+
+def live_titles(store):
+    return Counter(store._titles[store._title_refs[row]] for row in store._live_rows())
+
+def assert_title_table_matches(store):
+    # Cada cadena de la tabla la usa al menos una fila viva y su contador coincide
+    titles = live_titles(store)
+    assert store._title_index == {title: ref for ref, title in enumerate(store._titles) if title is not None}
+    assert {title: store._title_counts[ref] for title, ref in store._title_index.items()} == titles
+
+def test_repeated_renames_keep_title_table_bounded():
+    store = TaskStore()
+    task = store.add("inicial")
+    for i in range(100_000):
+        store.update(task["id"], title=f"título {i}")
+    assert len(store._titles) <= 2
+    assert store.get(task["id"])["title"] == "título 99999"
+    assert_title_table_matches(store)
+
+def test_bulk_updates_and_deletes_release_titles():
+    store = TaskStore()
+    for i in range(10):
+        store.add(f"tarea {i}", done=i % 2 == 0)
+    for i in range(1_000):
+        store.update_many(where_done=True, title=f"lote {i}")
+        store.update_many(task_ids=[2, 4], title=f"ids {i}")
+    # Como mucho una cadena por fila viva, más el hueco que usa un renombrado en curso
+    assert len(store._titles) <= len(store) + 1
+    assert_title_table_matches(store)
+
+    store.delete_many(where_done=True)
+    store.delete_many(task_ids=[2])
+    assert_title_table_matches(store)
+    assert len(store) == 4
+
+def test_freed_slots_are_reused():
+    store = TaskStore()
+    first = store.add("a")
+    store.add("b")
+    store.delete(first["id"])
+    store.add("c")
+    assert len(store._titles) == 2
+    assert [store.get(task_id)["title"] for task_id in (2, 3)] == ["b", "c"]
+    assert_title_table_matches(store)
@@ -0,0 +1,107 @@
+"""
+Benchmark de la pila de middlewares: BaseHTTPMiddleware / app.middleware("http") frente a ASGI puro.
+
+Uso:
+    python bench_middlewares.py [número_de_peticiones]
+
+Monta dos aplicaciones idénticas con una ruta GET y otra POST, una con la implementación
+anterior de los middlewares y otra con las clases ASGI de `middlewares/`, y mide la latencia
+media por petición en proceso (httpx.ASGITransport, sin red).
+"""
+import asyncio
+import contextlib
+import io
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+from middlewares.custom_header import CustomHeaderMiddleware
+from middlewares.logging import LoggingMiddleware
+from middlewares.not_found_handler import NotFoundHandlerMiddleware
+
+# --- Implementación anterior (basada en BaseHTTPMiddleware) ---
+
+async def legacy_log_requests(request: Request, call_next):
+    start_time = time.time()
+    if request.method in ["POST", "PUT"]:
+        body = await request.body()
+        print(f"Request Body: {body.decode('utf-8')}")
+    response = await call_next(request)
+    process_time = time.time() - start_time
+    print(f"Request: {request.method} {request.url} - Processed in {process_time:.4f}s")
+    return response
+
+async def legacy_add_custom_header(request: Request, call_next):
+    response = await call_next(request)
+    response.headers["X-Custom-Header"] = "FastAPI-Demo"
+    return response
+
+class LegacyNotFoundHandlerMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path.startswith("/api"):
+            response = await call_next(request)
+            if response.status_code == 404:
+                return JSONResponse(content={"error": "Not Found"}, status_code=404)
+            return response
+        return await call_next(request)
+
+def add_routes(app: FastAPI):
+    @app.get("/api/ping")
+    def ping():
+        return {"message": "pong"}
+
+    @app.post("/api/echo")
+    async def echo(request: Request):
+        return await request.json()
+
+    return app
+
+def build_legacy_app():
+    app = add_routes(FastAPI())
+    app.middleware("http")(legacy_log_requests)
+    app.middleware("http")(legacy_add_custom_header)
+    app.add_middleware(LegacyNotFoundHandlerMiddleware)
+    return app
+
+def build_asgi_app():
+    app = add_routes(FastAPI())
+    app.add_middleware(LoggingMiddleware)
+    app.add_middleware(CustomHeaderMiddleware)
+    app.add_middleware(NotFoundHandlerMiddleware)
+    return app
+
+async def measure(app, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Calentamiento
+        for _ in range(50):
+            await client.get("/api/ping")
+        results = {}
+        for label, call in (
+            ("GET /api/ping", lambda: client.get("/api/ping")),
+            ("POST /api/echo", lambda: client.post("/api/echo", json={"name": "Item", "price": 1})),
+        ):
+            start = time.perf_counter()
+            for _ in range(requests):
+                await call()
+            results[label] = (time.perf_counter() - start) / requests * 1_000_000
+        return results
+
+async def main(requests: int):
+    # Los middlewares de logging imprimen cada petición: se descarta la salida durante la medida
+    with contextlib.redirect_stdout(io.StringIO()):
+        legacy = await measure(build_legacy_app(), requests)
+        asgi = await measure(build_asgi_app(), requests)
+
+    print(f"{requests} peticiones por caso (latencia media por petición)")
+    print(f"{'caso':<18}{'BaseHTTPMiddleware':>20}{'ASGI puro':>12}{'diferencia':>14}")
+    for label in legacy:
+        diff = legacy[label] - asgi[label]
+        print(f"{label:<18}{legacy[label]:>18.1f}us{asgi[label]:>10.1f}us{diff:>12.1f}us")
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
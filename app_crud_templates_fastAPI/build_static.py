@@ -0,0 +1,66 @@
+"""
+Prepara los archivos estáticos para producción.
+
+Uso:
+    python build_static.py
+
+Para cada archivo de `static/` escribe en `static/dist/` una copia con el hash de su contenido
+en el nombre (p. ej. `styles.3f2a9c1b7d4e.css`) y, para los formatos de texto, sus variantes
+comprimidas `.gz` y `.br` (brotli es opcional: `pip install brotli`). También genera
+`static/dist/manifest.json`, que usa el helper `static_url()` de las plantillas.
+Como el nombre cambia cuando cambia el contenido, estos archivos se pueden cachear para siempre.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+# Las imágenes JPEG/PNG ya están comprimidas: solo se precomprimen los formatos de texto
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".html", ".json", ".txt"}
+
+def fingerprint(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def build():
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.makedirs(DIST_DIR)
+    manifest = {}
+    for root, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != DIST_DIR]
+        for filename in files:
+            source = os.path.join(root, filename)
+            relative = os.path.relpath(source, STATIC_DIR).replace(os.sep, "/")
+            name, extension = os.path.splitext(relative)
+            hashed = f"{name}.{fingerprint(source)}{extension}"
+            target = os.path.join(DIST_DIR, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+            manifest[relative] = f"dist/{hashed}"
+
+            if extension in COMPRESSIBLE_EXTENSIONS:
+                with open(source, "rb") as f:
+                    content = f.read()
+                with open(target + ".gz", "wb") as f:
+                    f.write(gzip.compress(content, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(target + ".br", "wb") as f:
+                        f.write(brotli.compress(content, quality=11))
+            print(f"{relative} -> {manifest[relative]}")
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    if brotli is None:
+        print("brotli no está instalado: solo se han generado las variantes .gz")
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from clients.resilience import BulkheadFullError, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+class UpstreamCache:
+    """
+    Caché en memoria para respuestas de APIs externas.
+
+    - Dentro de `ttl` segundos la respuesta se sirve directamente desde memoria.
+    - Entre `ttl` y `ttl + stale_while_revalidate` se sirve la copia antigua y se refresca
+      en segundo plano (stale-while-revalidate).
+    - Pasado ese tiempo, o si no hay copia, se espera a la API externa.
+    Las peticiones concurrentes para la misma clave comparten una única llamada (single-flight):
+    500 fallos de caché simultáneos generan una sola petición a la API externa.
+    """
+
+    def __init__(self, ttl: float = 60, stale_while_revalidate: float = 300):
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._entries = {}  # clave -> (valor, instante en que se obtuvo)
+        self._in_flight = {}  # clave -> asyncio.Task con la llamada en curso
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+
+    async def get(self, key, fetch):
+        """Devuelve el valor para `key`, usando `fetch` (función async sin argumentos) si hay que pedirlo."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            if age < self.ttl + self.stale_while_revalidate:
+                self.stale_hits += 1
+                self._refresh(key, fetch)  # En segundo plano: no se espera
+                return value
+        self.misses += 1
+        return await asyncio.shield(self._refresh(key, fetch))
+
+    def last_value(self, key):
+        """Última copia conocida aunque esté caducada, o None."""
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def _refresh(self, key, fetch) -> asyncio.Task:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch))
+            # Marca la excepción como recuperada si nadie espera la tarea (refresco en segundo plano)
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._in_flight[key] = task
+        return task
+
+    async def _fetch(self, key, fetch):
+        try:
+            self.upstream_calls += 1
+            value = await fetch()
+            self._entries[key] = (value, time.monotonic())
+            return value
+        except (CircuitOpenError, BulkheadFullError) as e:
+            # Rechazo rápido esperado mientras la API externa no responde: el circuit breaker
+            # ya registra sus cambios de estado, así que no se repite una traza por petición
+            logger.debug("Upstream call for %r rejected: %s", key, e)
+            raise
+        except Exception:
+            logger.warning("Error refreshing cached upstream response for %r", key, exc_info=True)
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "upstream_calls": self.upstream_calls,
+            "ttl": self.ttl,
+            "stale_while_revalidate": self.stale_while_revalidate,
+        }
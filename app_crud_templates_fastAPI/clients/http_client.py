@@ -0,0 +1,107 @@
+import os
+import time
+import httpx
+from fastapi import Request
+from timing import record_timing
+
+# Configuración del cliente HTTP saliente (se puede sobrescribir con variables de entorno)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_HTTP2 = os.getenv("HTTP_HTTP2", "false").lower() == "true"
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Envuelve el transporte de httpx para contar peticiones, errores y peticiones en curso
+    (desde que se envía la petición hasta que llegan las cabeceras de la respuesta).
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self.transport = transport
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            return await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            # Fase "upstream" de la cabecera Server-Timing de la petición que hizo la llamada
+            record_timing("upstream", time.perf_counter() - start)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+def _http2_available() -> bool:
+    # HTTP/2 es opcional: requiere el paquete h2 (pip install httpx[http2])
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Crea el cliente httpx compartido por toda la aplicación.
+    Reutiliza conexiones (keep-alive y sesiones TLS) entre peticiones en lugar de abrir
+    y cerrar un cliente por cada petición entrante.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=HTTP_HTTP2 and _http2_available(),
+    )
+    return httpx.AsyncClient(
+        transport=InstrumentedTransport(transport),
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+    )
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Dependencia de FastAPI que devuelve el cliente creado en el lifespan de la aplicación."""
+    return request.app.state.http_client
+
+def http_client_stats(client: httpx.AsyncClient) -> dict:
+    """
+    Métricas del cliente y ocupación del pool de conexiones.
+    El transporte del cliente y el pool de httpcore no forman parte de la API pública de httpx:
+    si una versión futura los cambia, se devuelven las métricas que sigan disponibles.
+    """
+    instrumented = getattr(client, "_transport", None)
+    if not isinstance(instrumented, InstrumentedTransport):
+        return {}
+    pool = getattr(instrumented.transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    stats = {
+        "requests": instrumented.requests,
+        "transport_errors": instrumented.errors,
+        "in_flight": instrumented.in_flight,
+        "peak_in_flight": instrumented.peak_in_flight,
+        "pool": None,
+    }
+    if connections is None:
+        return stats
+    connections = list(connections)
+    idle = sum(1 for connection in connections if connection.is_idle())
+    stats["pool"] = {
+        "max_connections": HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "open_connections": len(connections),
+        "active_connections": len(connections) - idle,
+        "idle_connections": idle,
+        "utilization": (len(connections) - idle) / HTTP_MAX_CONNECTIONS,
+    }
+    return stats
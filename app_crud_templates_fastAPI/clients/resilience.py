@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """El circuito está abierto: la llamada se rechaza sin contactar con el servicio externo."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open")
+        self.retry_after = retry_after
+
+class BulkheadFullError(Exception):
+    """No hay hueco libre en el bulkhead dentro del tiempo de espera máximo."""
+
+def is_upstream_failure(exc: Exception) -> bool:
+    """Errores de conexión/timeout y respuestas 5xx cuentan como fallo; un 4xx no."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, (httpx.RequestError, asyncio.TimeoutError))
+
+class CircuitBreaker:
+    """
+    Circuit breaker con estados closed, open y half_open.
+
+    - closed: las llamadas pasan y se registra el resultado de las últimas `window_size`.
+      Si hay al menos `minimum_calls` y la tasa de fallos llega a `failure_rate_threshold`, se abre.
+    - open: las llamadas fallan al momento (CircuitOpenError) durante `open_duration` segundos.
+    - half_open: se dejan pasar `half_open_max_calls` llamadas de prueba; si van bien se cierra,
+      si alguna falla se vuelve a abrir.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 20,
+        open_duration: float = 30,
+        half_open_max_calls: int = 1,
+        is_failure=is_upstream_failure,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure
+        self.state = self.CLOSED
+        self.transitions = Counter()  # "closed->open" -> número de veces
+        self.rejected = 0
+        self._results = deque(maxlen=window_size)  # True = fallo
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+    @property
+    def failure_rate(self) -> float:
+        return sum(self._results) / len(self._results) if self._results else 0.0
+
+    def _transition(self, new_state: str):
+        logger.warning("Circuit '%s': %s -> %s", self.name, self.state, new_state)
+        self.transitions[f"{self.state}->{new_state}"] += 1
+        self.state = new_state
+        if new_state == self.OPEN:
+            self._opened_at = time.monotonic()
+        elif new_state == self.HALF_OPEN:
+            self._half_open_calls = 0
+        else:
+            self._results.clear()
+
+    def _before_call(self):
+        if self.state == self.OPEN:
+            remaining = self.open_duration - (time.monotonic() - self._opened_at)
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, remaining)
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.open_duration)
+            self._half_open_calls += 1
+
+    def _on_success(self):
+        if self.state == self.HALF_OPEN:
+            self._transition(self.CLOSED)
+        else:
+            self._results.append(False)
+
+    def _on_failure(self):
+        if self.state == self.HALF_OPEN:
+            self._transition(self.OPEN)
+            return
+        self._results.append(True)
+        if len(self._results) >= self.minimum_calls and self.failure_rate >= self.failure_rate_threshold:
+            self._transition(self.OPEN)
+
+    async def call(self, func, *args, **kwargs):
+        """Ejecuta la función async `func` protegida por el circuito."""
+        self._before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as exc:
+            if self.is_failure(exc):
+                self._on_failure()
+            else:
+                self._on_success()
+            raise
+        self._on_success()
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failure_rate": self.failure_rate,
+            "calls_in_window": len(self._results),
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
+
+class Bulkhead:
+    """
+    Limita el número de llamadas salientes concurrentes. Si no queda hueco en `max_wait`
+    segundos la llamada se rechaza (BulkheadFullError) en lugar de acumular peticiones esperando.
+    """
+
+    def __init__(self, name: str, max_concurrent: int = 10, max_wait: float = 0.5):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self.active = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def __aenter__(self):
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise BulkheadFullError(f"Bulkhead '{self.name}' is full")
+        self.active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {"active": self.active, "max_concurrent": self.max_concurrent, "rejected": self.rejected}
@@ -0,0 +1,65 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.item import Item
+
+# Capa de servicio: la usan tanto las rutas de la API como las vistas web,
+# de modo que las vistas no necesitan llamar por HTTP a la propia aplicación.
+
+async def get_items(session: AsyncSession, offset: int = 0, limit: int = None):
+    result = await session.scalars(select(Item).order_by(Item.id).offset(offset).limit(limit))
+    return result.all()
+
+async def count_items(session: AsyncSession):
+    return await session.scalar(select(func.count()).select_from(Item))
+
+async def get_item_by_id(session: AsyncSession, item_id: int):
+    return await session.get(Item, item_id)
+
+async def create_item(session: AsyncSession, item_data: dict):
+    new_item = Item(**item_data)
+    session.add(new_item)
+    await session.commit()
+    return new_item
+
+async def update_item(session: AsyncSession, item_id: int, item_data: dict):
+    stored_item = await session.get(Item, item_id)
+    if stored_item is None:
+        return None
+    for field, value in item_data.items():
+        setattr(stored_item, field, value)
+    stored_item.version += 1
+    await session.commit()
+    return stored_item
+
+async def delete_item(session: AsyncSession, item_id: int):
+    stored_item = await session.get(Item, item_id)
+    if stored_item is None:
+        return None
+    await session.delete(stored_item)
+    await session.commit()
+    return stored_item
+
+async def search_items(session: AsyncSession, min_price: float = None, max_price: float = None, sort: str = None):
+    """
+    Consulta por rango de precio sobre el índice (price, id): O(log n + k).
+    sort: "price" (ascendente), "-price" (descendente) o "id".
+    """
+    query = select(Item)
+    if min_price is not None:
+        query = query.where(Item.price >= min_price)
+    if max_price is not None:
+        query = query.where(Item.price <= max_price)
+    if sort == "price":
+        query = query.order_by(Item.price, Item.id)
+    elif sort == "-price":
+        query = query.order_by(Item.price.desc(), Item.id.desc())
+    else:
+        query = query.order_by(Item.id)
+    result = await session.scalars(query)
+    return result.all()
+
+async def filter_items(session: AsyncSession, item_id: int, min_price: float, max_price: float):
+    result = await session.scalars(
+        select(Item).where(Item.id == item_id, Item.price >= min_price, Item.price <= max_price)
+    )
+    return result.all()
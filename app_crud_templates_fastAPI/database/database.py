@@ -1 +1,56 @@
-# Aquí iría el código de la base de datos
+import os
+import time
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from models.item import Base, Item
+from timing import record_timing
+
+# Base de datos SQLite asíncrona (aiosqlite): las consultas no bloquean el event loop.
+# Compartida por la API (/api/items) y las vistas web (/items).
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./items.db")
+
+engine = create_async_engine(DATABASE_URL, echo=False)
+async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL permite lecturas mientras se escribe; synchronous=NORMAL es seguro con WAL y más rápido
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+# Tiempo de cada consulta, para la fase "db" de la cabecera Server-Timing
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def start_query_timer(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def stop_query_timer(connection, cursor, statement, parameters, context, executemany):
+    record_timing("db", time.perf_counter() - connection.info["query_start"].pop())
+
+# Datos iniciales: se insertan solo si la tabla está vacía
+SEED_ITEMS = [
+    {"name": "Item 1", "description": "Description for Item 1", "price": 100, "image": "/static/images/queso1.jpg"},
+    {"name": "Item 2", "description": "Description for Item 2", "price": 200, "image": "/static/images/queso2.jpg"},
+    {"name": "Item 3", "description": "Description for Item 3", "price": 300, "image": "/static/images/queso1.jpg"},
+    {"name": "Item 4", "description": "Description for Item 4", "price": 400, "image": "/static/images/queso2.jpg"},
+    {"name": "Item 5", "description": "Description for Item 5", "price": 500, "image": "https://www.escueladesarts.com/wp-content/uploads/tipos-y-variedades-de-quesos.jpg"},
+]
+
+async def init_db():
+    """Crea las tablas e índices (si no existen) e inserta los datos iniciales. Se llama desde el lifespan."""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_session() as session:
+        if await session.scalar(select(func.count()).select_from(Item)) == 0:
+            session.add_all(Item(**item) for item in SEED_ITEMS)
+            await session.commit()
+
+async def close_db():
+    """Cierra las conexiones del pool al parar la aplicación."""
+    await engine.dispose()
+
+async def get_session():
+    async with async_session() as session:
+        yield session
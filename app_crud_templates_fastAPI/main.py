@@ -1,26 +1,51 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, Request
-from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
+from static_files import PrecompressedStaticFiles
 from fastapi.responses import HTMLResponse
 from routes.item import router as item_router
-from routes.item_web import router as item_web_router
-from middlewares.logging import log_requests
-from middlewares.custom_header import add_custom_header
-from middlewares.api_key import api_key_dependency
+from routes.item_web import router as item_web_router, products_cache, fakestore_breaker, fakestore_bulkhead
+from routes.image import router as image_router, create_image_executor
+from middlewares.logging import LoggingMiddleware
+from middlewares.custom_header import CustomHeaderMiddleware
+from middlewares.api_key import api_key_dependency, api_key_usage
 from middlewares.not_found_handler import NotFoundHandlerMiddleware
+from middlewares.compression import CompressionMiddleware
+from middlewares.server_timing import ServerTimingMiddleware
+from clients.http_client import create_http_client, http_client_stats
+from database.database import init_db, close_db
+from timing import TimedRoute
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Crea las tablas de SQLite (si no existen) al arrancar y cierra las conexiones al parar
+    await init_db()
+    # Cliente HTTP saliente compartido: se crea al arrancar y se cierra al parar la aplicación
+    app.state.http_client = create_http_client()
+    # Pool de procesos para generar miniaturas de imágenes sin bloquear el event loop
+    app.state.image_executor = create_image_executor()
+    yield
+    await app.state.http_client.aclose()
+    app.state.image_executor.shutdown()
+    await close_db()
+
+app = FastAPI(lifespan=lifespan)
+# Las rutas definidas en este archivo también miden su tiempo para la cabecera Server-Timing
+app.router.route_class = TimedRoute
 # app = FastAPI(redirect_slashes=False)  # Deshabilitar redirecciones automáticas. Evita el 307 temporary redirect
 
-# Configuración de Jinja2
-templates = Jinja2Templates(directory="templates")
-# Configuración de archivos estáticos con el prefijo "/static"
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Configuración de archivos estáticos con el prefijo "/static".
+# Los archivos con hash generados por build_static.py se sirven precomprimidos y con caché inmutable.
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
-# Registrar middlewares
-app.middleware("http")(log_requests)
-app.middleware("http")(add_custom_header)
+# Registrar middlewares (ASGI puros: el último añadido es el más externo)
+app.add_middleware(LoggingMiddleware)
+app.add_middleware(CustomHeaderMiddleware)
 app.add_middleware(NotFoundHandlerMiddleware)
+# Comprime las respuestas ya terminadas (JSON de /api/items, HTML de las vistas); solo queda fuera ServerTiming
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+# Cabecera Server-Timing con el desglose de tiempos de cada petición: el más externo, envuelve a CompressionMiddleware
+# para que el tiempo de compresión cuente en "mw"
+app.add_middleware(ServerTimingMiddleware)
 #Aplica de manera global el middleware de la API KEY a todos los endpoints
 # app.add_middleware(api_key_dependency)
 #app.router.dependencies.append(Depends(api_key_dependency))
@@ -29,6 +54,31 @@ app.add_middleware(NotFoundHandlerMiddleware)
 def read_root():
     return {"message": "Welcome to the FastAPI CRUD demo!"}
 
+@app.get("/metrics/http-client")
+def http_client_metrics(request: Request):
+    """Uso del cliente HTTP saliente compartido y ocupación de su pool de conexiones."""
+    return http_client_stats(request.app.state.http_client)
+
+@app.get("/metrics/upstream-cache")
+def upstream_cache_metrics():
+    """Aciertos, fallos y llamadas externas de la caché de productos de FakeStore."""
+    return products_cache.stats()
+
+@app.get("/metrics/circuit-breakers")
+def circuit_breaker_metrics():
+    """Estado, tasa de fallos y transiciones de los circuit breakers y bulkheads de llamadas salientes."""
+    return {
+        "fakestore": {
+            "circuit_breaker": fakestore_breaker.stats(),
+            "bulkhead": fakestore_bulkhead.stats(),
+        }
+    }
+
+@app.get("/metrics/api-keys")
+def api_key_metrics():
+    """Peticiones permitidas y rechazadas por límite de cada API KEY, y tokens disponibles."""
+    return api_key_usage()
+
 # Proteger un endpoint específico con la API KEY
 @app.get("/protected", dependencies=[Depends(api_key_dependency)])
 def protected_endpoint():
@@ -41,6 +91,7 @@ def protected_endpoint():
 # Registrar routers
 app.include_router(item_router, prefix="/api/items", tags=["API Items"])
 app.include_router(item_web_router, prefix="/items", tags=["Web Items"])
+app.include_router(image_router, prefix="/images", tags=["Images"])
 
 # Proteger todos los endpoints del router con la API KEY
 # app.include_router(item_router, prefix="/items", tags=["Items"], dependencies=[Depends(api_key_dependency)])
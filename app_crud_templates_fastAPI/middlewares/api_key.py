@@ -1,12 +1,89 @@
-from fastapi import Query, HTTPException
+import json
+import math
+import os
+import time
+from fastapi import Query, HTTPException, Response
+from timing import timed
 
-API_KEY = "ABC123"  # Clave API fake. Debería leerla de un archivo de configuración o variable de entorno o de la base de datos.
+# Registro de API KEYs: se lee de un archivo JSON con la forma
+# {"<api_key>": {"name": "demo", "burst": 20, "refill_rate": 5}}
+# burst es el número máximo de peticiones seguidas y refill_rate las peticiones por segundo sostenidas.
+API_KEYS_FILE = os.getenv("API_KEYS_FILE", "api_keys.json")
+DEFAULT_BURST = 20
+DEFAULT_REFILL_RATE = 5.0
 
-def api_key_dependency(api_key: str = Query(..., description="API Key required to access the endpoints")):
+class TokenBucket:
     """
-    Valida la API KEY proporcionada como parámetro de consulta.
+    Token bucket de una API KEY con sus contadores de uso.
+    Los tokens se recargan de forma perezosa al consultarlo, así que no hace falta ninguna tarea
+    en segundo plano. try_acquire es O(1) y no usa locks: solo se llama desde el event loop
+    (la dependencia es async) y no hay ningún await entre la lectura y la escritura del estado.
     """
-    if api_key != API_KEY:
+    __slots__ = ("name", "burst", "refill_rate", "tokens", "updated", "allowed", "rejected")
+
+    def __init__(self, name: str, burst: int = DEFAULT_BURST, refill_rate: float = DEFAULT_REFILL_RATE):
+        self.name = name
+        self.burst = burst
+        self.refill_rate = refill_rate
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.allowed = 0
+        self.rejected = 0
+
+    def try_acquire(self) -> float:
+        """Consume un token. Devuelve 0 si la petición se permite o los segundos que faltan para el siguiente token."""
+        now = time.monotonic()
+        tokens = min(self.burst, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+        if tokens >= 1:
+            self.tokens = tokens - 1
+            self.allowed += 1
+            return 0.0
+        self.tokens = tokens
+        self.rejected += 1
+        return (1 - tokens) / self.refill_rate
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "burst": self.burst,
+            "refill_rate": self.refill_rate,
+            "tokens": round(min(self.burst, self.tokens + (time.monotonic() - self.updated) * self.refill_rate), 2),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+def load_api_keys(path: str = API_KEYS_FILE) -> dict:
+    """Lee el registro de API KEYs. Si no existe el archivo se usa la clave de demo ABC123."""
+    if not os.path.exists(path):
+        return {"ABC123": TokenBucket("demo")}
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    return {
+        api_key: TokenBucket(
+            settings.get("name", api_key[:3] + "***"),
+            burst=int(settings.get("burst", DEFAULT_BURST)),
+            refill_rate=float(settings.get("refill_rate", DEFAULT_REFILL_RATE)),
+        )
+        for api_key, settings in config.items()
+    }
+
+api_keys = load_api_keys()
+
+def api_key_usage() -> dict:
+    """Uso por API KEY (identificada por su nombre, nunca por la clave)."""
+    return {bucket.name: bucket.stats() for bucket in api_keys.values()}
+
+async def api_key_dependency(response: Response, api_key: str = Query(..., description="API Key required to access the endpoints")):
+    """
+    Valida la API KEY proporcionada como parámetro de consulta y aplica su límite de peticiones.
+    """
+    with timed("dep"):
+        check_api_key(response, api_key)
+
+def check_api_key(response: Response, api_key: str):
+    bucket = api_keys.get(api_key)
+    if bucket is None:
         raise HTTPException(
             status_code=403,
             detail={
@@ -15,3 +92,16 @@ def api_key_dependency(api_key: str = Query(..., description="API Key required t
                 "hint": "Ensure you provide a valid 'api_key' query parameter."
             },
         )
+    retry_after = bucket.try_acquire()
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "error": "Too Many Requests",
+                "message": "Rate limit exceeded for this API KEY",
+                "hint": f"Retry after {math.ceil(retry_after)} seconds."
+            },
+            headers={"Retry-After": str(math.ceil(retry_after)), "X-RateLimit-Limit": str(bucket.burst), "X-RateLimit-Remaining": "0"},
+        )
+    response.headers["X-RateLimit-Limit"] = str(bucket.burst)
+    response.headers["X-RateLimit-Remaining"] = str(int(bucket.tokens))
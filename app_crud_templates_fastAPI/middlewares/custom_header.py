@@ -1,7 +1,24 @@
-from fastapi import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-async def add_custom_header(request: Request, call_next):
-    response: Response = await call_next(request)
-    response.headers["X-Custom-Header"] = "FastAPI-Demo"
-    return response
+class CustomHeaderMiddleware:
+    """
+    Middleware ASGI puro que añade la cabecera X-Custom-Header a todas las respuestas.
+    Modifica directamente el mensaje http.response.start, sin envolver la respuesta.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_header(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Custom-Header"] = "FastAPI-Demo"
+            await send(message)
+
+        await self.app(scope, receive, send_with_header)
@@ -1,15 +1,73 @@
+import random
 import time
-from fastapi import Request
-
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Leer el cuerpo de la solicitud si es POST o PUT
-    if request.method in ["POST", "PUT"]:
-        body = await request.body()
-        print(f"Request Body: {body.decode('utf-8')}")
-    
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    print(f"Request: {request.method} {request.url} - Processed in {process_time:.4f}s")
-    return response
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Tipos de contenido cuyo cuerpo tiene sentido imprimir; el resto (imágenes, ficheros...) se omite
+TEXT_CONTENT_TYPES = ("text/", "application/json", "application/x-www-form-urlencoded", "application/xml")
+
+class LoggingMiddleware:
+    """
+    Middleware ASGI puro que registra las peticiones y el tiempo de proceso.
+
+    El cuerpo de las peticiones POST/PUT se captura a medida que la aplicación lo lee,
+    sin consumirlo ni almacenarlo entero: solo se guardan los primeros `max_body_bytes`.
+    Se puede muestrear con `sample_rate` (0.0 - 1.0) y con tasas por prefijo de ruta
+    en `route_sample_rates`, por ejemplo {"/api/items": 0.1, "/static": 0.0}.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_bytes: int = 1024,
+        sample_rate: float = 1.0,
+        route_sample_rates: dict = None,
+    ):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.sample_rate = sample_rate
+        # Ordenados de más largo a más corto para que gane el prefijo más específico
+        self.route_sample_rates = sorted((route_sample_rates or {}).items(), key=lambda item: -len(item[0]))
+
+    def _should_log(self, path: str) -> bool:
+        rate = next((rate for prefix, rate in self.route_sample_rates if path.startswith(prefix)), self.sample_rate)
+        return rate >= 1.0 or random.random() < rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._should_log(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        captured = bytearray()
+        truncated = False
+
+        content_type = Headers(scope=scope).get("content-type", "")
+        capture_body = (
+            scope["method"] in ["POST", "PUT"]
+            and self.max_body_bytes > 0
+            and content_type.startswith(TEXT_CONTENT_TYPES)
+        )
+
+        async def peek_receive() -> Message:
+            # Copia como mucho max_body_bytes del cuerpo mientras pasa hacia la aplicación
+            nonlocal truncated
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                room = self.max_body_bytes - len(captured)
+                if room > 0:
+                    captured.extend(chunk[:room])
+                if len(chunk) > room:
+                    truncated = True
+            return message
+
+        await self.app(scope, peek_receive if capture_body else receive, send)
+        process_time = time.time() - start_time
+
+        if capture_body and captured:
+            suffix = " ...(truncated)" if truncated else ""
+            print(f"Request Body: {captured.decode('utf-8', errors='replace')}{suffix}")
+        request = Request(scope)
+        print(f"Request: {request.method} {request.url} - Processed in {process_time:.4f}s")
@@ -1,26 +1,55 @@
-from fastapi import Request
 from starlette.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class NotFoundHandlerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path.startswith("/api"):
-            try:
-                response = await call_next(request)
-                if response.status_code == 404:
-                    return JSONResponse(
-                        content={
-                            "error": "Not Found",
-                            "message": "The requested resource was not found.",
-                            "hint": "Check the URL or contact support if the issue persists."
-                        },
-                        status_code=404
-                    )
-                return response
-            except Exception as exc:
-                return JSONResponse(
-                    content={"error": "Internal Server Error", "message": str(exc)},
-                    status_code=500
-                )
-        # Si la ruta no comienza con /api/items, pasa la solicitud sin modificar
-        return await call_next(request)
+class NotFoundHandlerMiddleware:
+    """
+    Middleware ASGI puro que sustituye las respuestas 404 de las rutas /api por un JSON personalizado.
+    Solo intercepta el mensaje http.response.start; el resto de respuestas (incluidas las
+    StreamingResponse) pasan sin almacenarse en memoria.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Si la ruta no comienza con /api, pasa la solicitud sin modificar
+        if scope["type"] != "http" or not scope["path"].startswith("/api"):
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+        not_found = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started, not_found
+            if message["type"] == "http.response.start":
+                if message["status"] == 404:
+                    not_found = True  # Se descarta la respuesta original y su cuerpo
+                    return
+                response_started = True
+            elif not_found:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            response = JSONResponse(
+                content={"error": "Internal Server Error", "message": str(exc)},
+                status_code=500
+            )
+            await response(scope, receive, send)
+            return
+
+        if not_found:
+            response = JSONResponse(
+                content={
+                    "error": "Not Found",
+                    "message": "The requested resource was not found.",
+                    "hint": "Check the URL or contact support if the issue persists."
+                },
+                status_code=404
+            )
+            await response(scope, receive, send)
@@ -0,0 +1,29 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from timing import start_timing
+
+class ServerTimingMiddleware:
+    """
+    Middleware ASGI puro que crea el contexto de tiempos de la petición y lo envía en la
+    cabecera Server-Timing (visible en la pestaña Network de las devtools del navegador).
+    Debe ser el más externo para que "mw" y "total" incluyan el resto de middlewares.
+    Lo que ocurre después de enviar las cabeceras (por ejemplo el render en streaming) no se incluye.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = start_timing()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.header_value())
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
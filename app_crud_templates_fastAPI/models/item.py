@@ -1 +1,26 @@
-# Aquí iria el código de la base de datos
\ No newline at end of file
+from typing import Optional
+from sqlalchemy import Index, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+class Base(DeclarativeBase):
+    pass
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), index=True)
+    description: Mapped[str] = mapped_column(String(500))
+    price: Mapped[float]
+    # version cambia en cada actualización; la usa la caché de fragmentos de las plantillas
+    version: Mapped[int] = mapped_column(default=1)
+    image: Mapped[Optional[str]] = mapped_column(String(500))
+
+    __table_args__ = (
+        # Índice compuesto para las consultas por rango de precio ordenadas (precio, id):
+        # SQLite recorre solo el tramo del índice que cumple el filtro, sin ordenar después
+        Index("ix_items_price_id", "price", "id"),
+        # Sin AUTOINCREMENT SQLite reutiliza el id más alto tras borrarlo, y un item nuevo
+        # tendría la misma clave (id, version) que el borrado en la caché de fragmentos
+        {"sqlite_autoincrement": True},
+    )
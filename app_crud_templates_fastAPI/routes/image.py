@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import os
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+from PIL import Image, ImageOps
+from timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+STATIC_DIR = os.path.realpath("static")
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", ".image_cache")
+# Solo se generan estos anchos (se redondea hacia arriba) para que la caché no crezca sin límite
+ALLOWED_WIDTHS = (75, 150, 300, 600, 1200)
+DEFAULT_QUALITY = 80
+IMAGE_CACHE_CONTROL = "public, max-age=86400"
+
+# Hashes de las imágenes originales: (ruta, mtime, tamaño) -> sha256, para no releerlas en cada petición
+_source_hashes = {}
+# Variantes que se están generando ahora mismo, para no redimensionar dos veces la misma
+_in_progress = {}
+
+def create_image_executor() -> ProcessPoolExecutor:
+    """Pool de procesos para redimensionar fuera del event loop (y fuera del GIL)."""
+    return ProcessPoolExecutor(max_workers=int(os.getenv("IMAGE_WORKERS", "2")))
+
+def thumbnail_url(src: str, width: int) -> str:
+    """
+    Helper de las plantillas: {{ thumbnail_url(item.image, 150) }}.
+    Las imágenes locales (/static/...) pasan por el endpoint de miniaturas; las externas se dejan igual.
+    """
+    if not src or not src.startswith("/static/"):
+        return src
+    return f"/images/thumbnail?src={quote(src)}&w={width}"
+
+def render_thumbnail(source_path: str, target_path: str, width: int, quality: int, image_format: str):
+    """Se ejecuta en el pool de procesos: redimensiona, recodifica y escribe la variante en disco."""
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            image.thumbnail((width, image.height), Image.LANCZOS)
+        if image_format == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        temporary_path = f"{target_path}.{os.getpid()}.tmp"
+        image.save(temporary_path, format=image_format.upper(), quality=quality, optimize=True)
+    os.replace(temporary_path, target_path)  # Escritura atómica: nunca se sirve un archivo a medias
+
+def resolve_source(src: str) -> str:
+    if not src.startswith("/static/"):
+        raise HTTPException(status_code=400, detail="Only local /static images can be resized")
+    source_path = os.path.realpath(os.path.join(STATIC_DIR, src[len("/static/"):]))
+    if not source_path.startswith(STATIC_DIR + os.sep) or not os.path.isfile(source_path):
+        raise HTTPException(status_code=404, detail="Image not found")
+    return source_path
+
+def source_hash(source_path: str) -> str:
+    stat_result = os.stat(source_path)
+    key = (source_path, stat_result.st_mtime_ns, stat_result.st_size)
+    digest = _source_hashes.get(key)
+    if digest is None:
+        with open(source_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        _source_hashes[key] = digest
+    return digest
+
+@router.get("/thumbnail")
+async def thumbnail(
+    request: Request,
+    src: str = Query(..., description="Ruta de la imagen original, por ejemplo /static/images/queso1.jpg"),
+    w: int = Query(150, ge=1, le=ALLOWED_WIDTHS[-1], description="Ancho deseado en píxeles"),
+    q: int = Query(DEFAULT_QUALITY, ge=30, le=95, description="Calidad de compresión"),
+    fmt: str = Query(None, pattern="^(webp|jpeg)$", description="Formato de salida; por defecto WebP si el navegador lo acepta"),
+):
+    """
+    Devuelve la imagen redimensionada al ancho pedido. Las variantes se guardan en disco
+    con una clave formada por el hash de la imagen original y los parámetros.
+    """
+    source_path = resolve_source(src)
+    width = next(allowed for allowed in ALLOWED_WIDTHS if allowed >= w)
+    image_format = fmt or ("webp" if "image/webp" in request.headers.get("accept", "") else "jpeg")
+
+    digest = await asyncio.to_thread(source_hash, source_path)
+    target_path = os.path.join(IMAGE_CACHE_DIR, f"{digest}-w{width}-q{q}.{image_format}")
+    if not os.path.exists(target_path):
+        task = _in_progress.get(target_path)
+        if task is None:
+            os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+            loop = asyncio.get_running_loop()
+            task = asyncio.ensure_future(loop.run_in_executor(
+                request.app.state.image_executor, render_thumbnail, source_path, target_path, width, q, image_format
+            ))
+            _in_progress[target_path] = task
+            task.add_done_callback(lambda _: _in_progress.pop(target_path, None))
+        await asyncio.shield(task)
+
+    headers = {"Cache-Control": IMAGE_CACHE_CONTROL}
+    if fmt is None:
+        headers["Vary"] = "Accept"  # El formato depende de la cabecera Accept
+    return FileResponse(target_path, media_type=f"image/{image_format}", headers=headers)
@@ -1,85 +1,83 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from schemas.item import ItemCreate, ItemResponse
 from middlewares.api_key import api_key_dependency
-from fastapi.templating import Jinja2Templates
+from crud import item as item_crud
+from database.database import get_session
+from templating import fragment_cache
+from timing import TimedRoute
 
-templates = Jinja2Templates(directory="templates")
-
-router = APIRouter()
-
-# Fake storage
-fake_items_db = [
-    {"id": 1, "name": "Item 1", "description": "Description for Item 1", "price": 100},
-    {"id": 2, "name": "Item 2", "description": "Description for Item 2", "price": 200},
-    {"id": 3, "name": "Item 3", "description": "Description for Item 3", "price": 300},
-    {"id": 4, "name": "Item 4", "description": "Description for Item 4", "price": 400},
-    {"id": 5, "name": "Item 5", "description": "Description for Item 5", "price": 500},
-]
-item_id_counter = 6  # Start counter after the last ID
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/", response_model=list[ItemResponse])
-def read_items():
-    return fake_items_db
+async def read_items(
+    min_price: float = Query(None, description="Minimum price (inclusive)"),
+    max_price: float = Query(None, description="Maximum price (inclusive)"),
+    sort: str = Query(None, pattern="^(price|-price|id)$", description="Sort order: price, -price or id"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Lista los items. Con min_price / max_price se filtra por rango de precio usando el índice
+    (price, id) de la base de datos.
+    GET /api/items?min_price=100&max_price=300&sort=-price
+    """
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=400, detail="min_price must be less than or equal to max_price")
+    return await item_crud.search_items(session, min_price, max_price, sort)
 
 @router.get("/{item_id}", response_model=ItemResponse)
-def read_item(item_id: int):
-    for item in fake_items_db:
-        if item["id"] == item_id:
-            return item
+async def read_item(item_id: int, session: AsyncSession = Depends(get_session)):
+    item = await item_crud.get_item_by_id(session, item_id)
+    if item is not None:
+        return item
     raise HTTPException(status_code=404, detail="Item not found")
 
 @router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(api_key_dependency)])
-def create_item(item: ItemCreate):
+async def create_item(item: ItemCreate, session: AsyncSession = Depends(get_session)):
     """
     Este endpoint está protegido con la API KEY.
     Solo se puede acceder si se proporciona una API KEY válida como parámetro de consulta.
     """
-    global item_id_counter
-    new_item = {"id": item_id_counter, **item.dict()}
-    fake_items_db.append(new_item)
-    item_id_counter += 1
-    return new_item
+    return await item_crud.create_item(session, item.dict())
 
 @router.put("/{item_id}", response_model=ItemResponse, status_code=status.HTTP_200_OK, dependencies=[Depends(api_key_dependency)])
-def update_item(item_id: int, item: ItemCreate):
+async def update_item(item_id: int, item: ItemCreate, session: AsyncSession = Depends(get_session)):
     """
     Este endpoint está protegido con la API KEY.
     Solo se puede acceder si se proporciona una API KEY válida como parámetro de consulta.
     """
-    for stored_item in fake_items_db:
-        if stored_item["id"] == item_id:
-            stored_item.update(item.dict())
-            return stored_item
+    stored_item = await item_crud.update_item(session, item_id, item.dict())
+    if stored_item is not None:
+        return stored_item
     raise HTTPException(status_code=404, detail="Item not found")
 
 @router.delete("/{item_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(api_key_dependency)])
-def delete_item(item_id: int):
+async def delete_item(item_id: int, session: AsyncSession = Depends(get_session)):
     """
     Este endpoint está protegido con la API KEY.
     Solo se puede acceder si se proporciona una API KEY válida como parámetro de consulta.
     DELETE /items/{item_id}
     """
-    for index, stored_item in enumerate(fake_items_db):
-        if stored_item["id"] == item_id:
-            del fake_items_db[index]
-            return {"message": "Item deleted successfully"}
+    deleted_item = await item_crud.delete_item(session, item_id)
+    if deleted_item is not None:
+        # Ninguna fila del item borrado (de ninguna versión) debe volver a servirse desde la caché de fragmentos
+        fragment_cache.invalidate("item_row.html", deleted_item.id)
+        return {"message": "Item deleted successfully"}
     raise HTTPException(status_code=404, detail="Item not found")
 
 @router.get("/{item_id}/filter", response_model=list[ItemResponse])
-def filter_items(
+async def filter_items(
     item_id: int,
     min_price: int = Query(0, description="Minimum price to filter items"),
     max_price: int = Query(1000, description="Maximum price to filter items"),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Endpoint que utiliza parámetros de ruta y parámetros de consulta.
     Filtra los items por rango de precio.
     GET /items/{item_id}/filter?min_price=0&max_price=1000
     """
-    filtered_items = [
-        item for item in fake_items_db
-        if item["id"] == item_id and min_price <= item["price"] <= max_price
-    ]
+    filtered_items = await item_crud.filter_items(session, item_id, min_price, max_price)
     if not filtered_items:
         raise HTTPException(status_code=404, detail="No items found matching the criteria")
     return filtered_items
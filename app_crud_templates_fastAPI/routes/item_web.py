@@ -1,62 +1,174 @@
-from fastapi import APIRouter, Request, HTTPException
+import math
+from fastapi import APIRouter, Request, HTTPException, Depends, Query
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+import os
 import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+from crud import item as item_crud
+from database.database import get_session
+from templating import templates, stream_template, STREAM_THRESHOLD
+from clients.http_client import get_http_client
+from clients.cache import UpstreamCache
+from clients.resilience import Bulkhead, BulkheadFullError, CircuitBreaker, CircuitOpenError
+from timing import TimedRoute
 
-templates = Jinja2Templates(directory="templates")
+router = APIRouter(route_class=TimedRoute)
 
-router = APIRouter()
+# URL de la API externa (configurable para poder probar contra un servidor stub local)
+FAKESTORE_API_URL = os.getenv("FAKESTORE_API_URL", "https://fakestoreapi.com")
 
-# Fake storage (importar desde item.py si es necesario)
-fake_items_db = [
-    {"id": 1, "name": "Item 1", "description": "Description for Item 1", "price": 100, "image": "/static/images/queso1.jpg"},
-    {"id": 2, "name": "Item 2", "description": "Description for Item 2", "price": 200, "image": "/static/images/queso2.jpg"},
-    {"id": 3, "name": "Item 3", "description": "Description for Item 3", "price": 300, "image": "/static/images/queso1.jpg"},
-    {"id": 4, "name": "Item 4", "description": "Description for Item 4", "price": 400, "image": "/static/images/queso2.jpg"},
-    {"id": 5, "name": "Item 5", "description": "Description for Item 5", "price": 500, "image": "https://www.escueladesarts.com/wp-content/uploads/tipos-y-variedades-de-quesos.jpg"}
-]
+# Caché de los productos de FakeStore: 60s frescos y hasta 5 minutos más sirviendo la copia
+# antigua mientras se refresca en segundo plano
+products_cache = UpstreamCache(
+    ttl=float(os.getenv("FAKESTORE_CACHE_TTL", "60")),
+    stale_while_revalidate=float(os.getenv("FAKESTORE_CACHE_SWR", "300")),
+)
+
+# Protección de las llamadas a FakeStore: si falla a menudo se deja de llamar durante un tiempo
+# (circuit breaker) y nunca hay más de 10 llamadas salientes a la vez (bulkhead)
+fakestore_breaker = CircuitBreaker("fakestore", failure_rate_threshold=0.5, minimum_calls=5, open_duration=30)
+fakestore_bulkhead = Bulkhead("fakestore", max_concurrent=10, max_wait=0.5)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Un umbral mayor que el tamaño máximo de página nunca se alcanzaría: se limita a él
+STREAM_PAGE_SIZE = min(STREAM_THRESHOLD, MAX_PAGE_SIZE)
+
+def pagination_info(total: int, page: int, page_size: int):
+    """Datos de paginación para las plantillas."""
+    total_pages = max(1, math.ceil(total / page_size))
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": total_pages,
+        "previous_page": page - 1 if page > 1 else None,
+        "next_page": page + 1 if page < total_pages else None,
+    }
+
+def paginate(sequence, page: int, page_size: int):
+    """
+    Devuelve los elementos de la página pedida y los datos de paginación para las plantillas.
+    Solo se renderiza la página, así que el coste no crece con el tamaño del catálogo.
+    """
+    start = (page - 1) * page_size
+    return sequence[start:start + page_size], pagination_info(len(sequence), page, page_size)
+
+async def paginate_items(session: AsyncSession, page: int, page_size: int):
+    """Como paginate(), pero la base de datos devuelve solo la página pedida (LIMIT/OFFSET)."""
+    items = await item_crud.get_items(session, offset=(page - 1) * page_size, limit=page_size)
+    return items, pagination_info(await item_crud.count_items(session), page, page_size)
+
+def render_rows(request: Request, template_name: str, context: dict, pagination: dict) -> HTMLResponse:
+    """
+    Devuelve solo las filas <li> de una página para que el cliente las añada a la lista
+    sin volver a renderizar la cabecera ni el layout. La siguiente página va en X-Next-Page.
+    """
+    response = templates.TemplateResponse(template_name, {"request": request, **context, "pagination": pagination})
+    if pagination["next_page"]:
+        response.headers["X-Next-Page"] = str(pagination["next_page"])
+    return response
 
 @router.get("/", response_class=HTMLResponse)
-async def read_items(request: Request):
-    return templates.TemplateResponse("items.html", {"request": request, "items": fake_items_db})
+async def read_items(
+    request: Request,
+    page: int = Query(1, ge=1, description="Página a mostrar"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Items por página"),
+    session: AsyncSession = Depends(get_session),
+):
+    items, pagination = await paginate_items(session, page, page_size)
+    context = {"request": request, "items": items, "pagination": pagination}
+    # Con páginas grandes se envía en streaming para que el navegador empiece a pintar antes
+    if len(items) >= STREAM_PAGE_SIZE:
+        return stream_template("items.html", context)
+    return templates.TemplateResponse("items.html", context)
+
+@router.get("/fragments/rows", response_class=HTMLResponse)
+async def read_item_rows(
+    request: Request,
+    page: int = Query(1, ge=1, description="Página a mostrar"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Items por página"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Devuelve solo las filas <li> de una página de items (para el botón "Cargar más").
+    """
+    items, pagination = await paginate_items(session, page, page_size)
+    return render_rows(request, "item_rows.html", {"items": items}, pagination)
 
 @router.get("/{item_id}", response_class=HTMLResponse)
-async def read_item(request: Request, item_id: int):
-    item = next((item for item in fake_items_db if item["id"] == item_id), None)
+async def read_item(request: Request, item_id: int, session: AsyncSession = Depends(get_session)):
+    item = await item_crud.get_item_by_id(session, item_id)
     if not item:
         return templates.TemplateResponse("404.html", {"request": request}, status_code=404)
     return templates.TemplateResponse("item_detail.html", {"request": request, "item": item})
 
 @router.get("/fetch/{item_id}", response_class=HTMLResponse)
-async def fetch_item_from_api(request: Request, item_id: int):
+async def fetch_item_from_api(request: Request, item_id: int, session: AsyncSession = Depends(get_session)):
     """
-    Este endpoint llama internamente al endpoint /api/items/{item_id} para obtener los datos del recurso.
+    Este endpoint obtiene los datos del recurso a través de la misma capa de servicio (crud/item.py)
+    que usa el endpoint /api/items/{item_id}, sin hacer una llamada HTTP a la propia aplicación.
     """
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"http://127.0.0.1:8000/api/items/{item_id}")
-            response.raise_for_status()  # Lanza una excepción si el código de estado no es 2xx
-        item = response.json()
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 404:
-            return templates.TemplateResponse("404.html", {"request": request}, status_code=404)
-        raise HTTPException(status_code=e.response.status_code, detail="Error al obtener el recurso")
-    except httpx.RequestError:
-        raise HTTPException(status_code=500, detail="Error de conexión con el servidor interno")
+    item = await item_crud.get_item_by_id(session, item_id)
+    if not item:
+        return templates.TemplateResponse("404.html", {"request": request}, status_code=404)
     return templates.TemplateResponse("item_detail.html", {"request": request, "item": item})
 
-@router.get("/external/products", response_class=HTMLResponse)
-async def fetch_products_from_fakestore(request: Request):
+async def get_products(client: httpx.AsyncClient):
     """
-    Este endpoint llama a la API de fakestoreapi para obtener los productos y renderiza una vista con ellos.
+    Obtiene los productos de fakestoreapi usando el cliente HTTP compartido de la aplicación y la
+    caché `products_cache`, de modo que casi siempre se sirven desde memoria y las peticiones
+    simultáneas comparten una sola llamada externa.
     """
+    async def request_products():
+        response = await client.get(f"{FAKESTORE_API_URL}/products")
+        response.raise_for_status()  # Lanza una excepción si el código de estado no es 2xx
+        return response.json()
+
+    async def fetch_products():
+        async with fakestore_bulkhead:
+            return await fakestore_breaker.call(request_products)
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://fakestoreapi.com/products")
-            response.raise_for_status()  # Lanza una excepción si el código de estado no es 2xx
-        products = response.json()
+        return await products_cache.get("products", fetch_products)
+    except (CircuitOpenError, BulkheadFullError) as e:
+        # Fallo rápido: se sirve la última copia buena si existe, sin esperar a la API externa
+        products = products_cache.last_value("products")
+        if products is None:
+            headers = {"Retry-After": str(int(e.retry_after) + 1)} if isinstance(e, CircuitOpenError) else None
+            raise HTTPException(status_code=503, detail="La API externa no está disponible", headers=headers)
+        return products
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail="Error al obtener los productos")
     except httpx.RequestError:
         raise HTTPException(status_code=500, detail="Error de conexión con la API externa")
-    return templates.TemplateResponse("products.html", {"request": request, "products": products})
\ No newline at end of file
+
+@router.get("/external/products", response_class=HTMLResponse)
+async def fetch_products_from_fakestore(
+    request: Request,
+    page: int = Query(1, ge=1, description="Página a mostrar"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Productos por página"),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
+    """
+    Este endpoint llama a la API de fakestoreapi para obtener los productos y renderiza una vista
+    con una página de ellos.
+    """
+    products, pagination = paginate(await get_products(client), page, page_size)
+    context = {"request": request, "products": products, "pagination": pagination}
+    if len(products) >= STREAM_PAGE_SIZE:
+        return stream_template("products.html", context)
+    return templates.TemplateResponse("products.html", context)
+
+@router.get("/external/products/fragments/rows", response_class=HTMLResponse)
+async def fetch_product_rows(
+    request: Request,
+    page: int = Query(1, ge=1, description="Página a mostrar"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Productos por página"),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
+    """
+    Devuelve solo las filas <li> de una página de productos (para el botón "Cargar más").
+    """
+    products, pagination = paginate(await get_products(client), page, page_size)
+    return render_rows(request, "product_rows.html", {"products": products}, pagination)
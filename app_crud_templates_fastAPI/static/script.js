@@ -9,6 +9,24 @@ document.addEventListener("DOMContentLoaded", () => {
             alert(`Has seleccionado el item: ${item.textContent}`);
         });
     });
+
+    // "Cargar más": pide solo las filas <li> de la siguiente página y las añade a la lista
+    document.querySelectorAll("button.load-more").forEach(button => {
+        button.addEventListener("click", async () => {
+            const list = document.getElementById(button.dataset.list);
+            const response = await fetch(`${button.dataset.url}&page=${button.dataset.nextPage}`);
+            if (!response.ok) {
+                return;
+            }
+            list.insertAdjacentHTML("beforeend", await response.text());
+            const nextPage = response.headers.get("X-Next-Page");
+            if (nextPage) {
+                button.dataset.nextPage = nextPage;
+            } else {
+                button.remove();
+            }
+        });
+    });
 });
 
 console.log("Terminado!")
\ No newline at end of file
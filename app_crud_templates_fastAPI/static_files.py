@@ -0,0 +1,77 @@
+import json
+import mimetypes
+import os
+import stat
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+STATIC_URL = "/static"
+MANIFEST_PATH = os.path.join("static", "dist", "manifest.json")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Preferencia de codificación: brotli comprime más que gzip
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def load_manifest() -> dict:
+    """Manifest generado por build_static.py; vacío si no se ha ejecutado el build."""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+manifest = load_manifest()
+
+def static_url(path: str) -> str:
+    """
+    Helper de las plantillas: {{ static_url('styles.css') }} devuelve la URL con hash
+    (/static/dist/styles.<hash>.css) si existe en el manifest, o la URL normal si no.
+    """
+    return f"{STATIC_URL}/{manifest.get(path, path)}"
+
+def accepted_encodings(scope: Scope) -> set:
+    accepted = set()
+    for part in Headers(scope=scope).get("accept-encoding", "").split(","):
+        encoding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(encoding.strip().lower())
+    return accepted
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles que, para los archivos con hash de `dist/`, sirve la variante precomprimida
+    (.br o .gz) que acepte el cliente y añade Cache-Control: immutable.
+    El resto de archivos se sirven como siempre.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if not path.startswith("dist/"):
+            return await super().get_response(path, scope)
+
+        accepted = accepted_encodings(scope)
+        for encoding, extension in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + extension)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                response = FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    # El tipo es el del archivo original, no el de la variante comprimida
+                    media_type=mimetypes.guess_type(path)[0] or "text/plain",
+                    headers={"Content-Encoding": encoding},
+                )
+                return self._cacheable(response, scope)
+
+        return self._cacheable(await super().get_response(path, scope), scope)
+
+    def _cacheable(self, response: Response, scope: Scope) -> Response:
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        response.headers["Vary"] = "Accept-Encoding"
+        if response.status_code == 200 and self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,102 @@
+import os
+from collections import OrderedDict
+from threading import Lock
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from markupsafe import Markup
+from static_files import static_url
+from routes.image import thumbnail_url
+from timing import timed
+
+# Entorno de Jinja2 único para toda la aplicación (API, vistas web y páginas de error).
+# El bytecode cache guarda en disco las plantillas ya compiladas, así que tras un reinicio
+# no hay que volver a compilarlas.
+TEMPLATES_DIR = "templates"
+BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR", ".jinja_cache")
+FRAGMENT_CACHE_SIZE = int(os.getenv("JINJA_FRAGMENT_CACHE_SIZE", "10000"))
+# A partir de este número de elementos las listas se envían en streaming
+# (las vistas lo limitan a su tamaño máximo de página para que siempre sea alcanzable)
+STREAM_THRESHOLD = int(os.getenv("JINJA_STREAM_THRESHOLD", "50"))
+
+class TimedTemplate(Template):
+    """Plantilla que suma su tiempo de render a la fase "render" de la cabecera Server-Timing."""
+
+    def render(self, *args, **kwargs):
+        with timed("render"):
+            return super().render(*args, **kwargs)
+
+os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    bytecode_cache=FileSystemBytecodeCache(BYTECODE_CACHE_DIR),
+    autoescape=True,
+)
+env.template_class = TimedTemplate
+templates = Jinja2Templates(env=env)
+# URLs con hash de los archivos estáticos: {{ static_url('styles.css') }}
+env.globals["static_url"] = static_url
+# Miniaturas de las imágenes locales: {{ thumbnail_url(item.image, 150) }}
+env.globals["thumbnail_url"] = thumbnail_url
+
+class FragmentCache:
+    """
+    Caché LRU de fragmentos HTML ya renderizados (cabecera, filas de la lista de items...).
+    La clave la decide quien llama y debe identificar el contenido, por ejemplo (item.id, item.version):
+    cuando el item cambia de versión se renderiza de nuevo. Si la plantilla se recarga tras
+    modificarse, su caché anterior deja de usarse.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()  # Las plantillas en streaming se renderizan en el threadpool
+
+    def render(self, template_name: str, key=None, **context) -> Markup:
+        template = env.get_template(template_name)
+        cache_key = (template_name, id(template), key)
+        with self._lock:
+            html = self._entries.get(cache_key)
+            if html is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return html
+        html = Markup(template.render(**context))
+        with self._lock:
+            self.misses += 1
+            self._entries[cache_key] = html
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return html
+
+    def invalidate(self, template_name: str, key_prefix):
+        """
+        Descarta las copias de un fragmento (de cualquier versión de la plantilla) cuya clave empiece
+        por key_prefix. Con claves (item.id, item.version), invalidate("item_row.html", item.id) borra
+        todas las versiones ya renderizadas de la fila, por ejemplo al borrar el item.
+        """
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == template_name and self._key_matches(k[2], key_prefix)]:
+                del self._entries[cache_key]
+
+    @staticmethod
+    def _key_matches(key, key_prefix) -> bool:
+        return key == key_prefix or (isinstance(key, tuple) and key[:1] == (key_prefix,))
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+fragment_cache = FragmentCache(FRAGMENT_CACHE_SIZE)
+# Uso en las plantillas: {{ fragment("header.html") }} o {{ fragment("item_row.html", key=(item.id, item.version), item=item) }}
+env.globals["fragment"] = fragment_cache.render
+
+def stream_template(name: str, context: dict, status_code: int = 200) -> StreamingResponse:
+    """
+    Renderiza la plantilla con Template.generate y envía cada trozo en cuanto está listo,
+    de modo que los primeros bytes salen antes de que termine el bucle de una lista grande.
+    El generador es síncrono, así que Starlette lo recorre en el threadpool sin bloquear el event loop.
+    """
+    template = env.get_template(name)
+    return StreamingResponse(template.generate(**context), status_code=status_code, media_type="text/html")
@@ -0,0 +1,89 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi.routing import APIRoute
+
+# Fases que se miden en cada petición y su descripción en la cabecera Server-Timing
+PHASES = {
+    "mw": "Middlewares",
+    "dep": "Dependencias",
+    "db": "Base de datos",
+    "upstream": "APIs externas",
+    "render": "Jinja",
+    "app": "Endpoint",
+}
+
+class ServerTiming:
+    """
+    Tiempos de una petición, acumulados por fase (en segundos).
+    Vive en una ContextVar, así que lo ven el endpoint, las dependencias (también las que se
+    ejecutan en el threadpool), los eventos de SQLAlchemy y las llamadas de httpx de esa petición.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations = {}
+        self._active = set()
+
+    def record(self, phase: str, seconds: float):
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    def header_value(self) -> str:
+        total = time.perf_counter() - self.start
+        durations = dict(self.durations)
+        if "app" in durations:
+            # Lo que no se ha pasado dentro del endpoint se ha pasado en los middlewares
+            durations["mw"] = max(0.0, total - durations["app"])
+        parts = [
+            f'{phase};dur={durations[phase] * 1000:.2f};desc="{description}"'
+            for phase, description in PHASES.items()
+            if phase in durations
+        ]
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+_current_timing = ContextVar("server_timing", default=None)
+
+def start_timing() -> ServerTiming:
+    timing = ServerTiming()
+    _current_timing.set(timing)
+    return timing
+
+def record_timing(phase: str, seconds: float):
+    """Suma seconds a la fase de la petición en curso (no hace nada fuera de una petición)."""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.record(phase, seconds)
+
+@contextmanager
+def timed(phase: str):
+    """
+    Mide el bloque y lo suma a la fase. Los bloques anidados de la misma fase (por ejemplo un
+    fragmento renderizado dentro de otra plantilla) solo se cuentan una vez.
+    """
+    timing = _current_timing.get()
+    if timing is None or phase in timing._active:
+        yield
+        return
+    timing._active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing._active.discard(phase)
+        timing.record(phase, time.perf_counter() - start)
+
+class TimedRoute(APIRoute):
+    """
+    Ruta de FastAPI que mide el tiempo del endpoint completo (dependencias, endpoint y
+    serialización de la respuesta) como fase "app". Se usa con APIRouter(route_class=TimedRoute).
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            with timed("app"):
+                return await handler(request)
+
+        return timed_handler
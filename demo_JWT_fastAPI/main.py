@@ -1,42 +1,203 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Body
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 import jwt
 from typing import List
 import uvicorn
+import hashlib
+import math
+import time
+from uuid import uuid4
+from collections import OrderedDict
+from itertools import count
+from threading import Lock
 from datetime import datetime, timedelta
+from middlewares.compression import CompressionMiddleware
 
 app = FastAPI()
 
+# Compress JSON responses larger than 500 bytes (e.g. /books) with zstd, brotli or gzip
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
 # Secret key for JWT
 SECRET_KEY = "your_secret_key"
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-# In-memory books storage
-books = [
+# In-memory books storage, keyed by a stable id.
+# Ids come from a monotonic counter and are never reused, so deleting a book
+# does not change which book any other id refers to.
+book_ids = count(1)
+books = {}
+for _book in [
     {"title": "1984", "author": "George Orwell"},
     {"title": "To Kill a Mockingbird", "author": "Harper Lee"},
     {"title": "The Great Gatsby", "author": "F. Scott Fitzgerald"}
-]
+]:
+    _book_id = next(book_ids)
+    books[_book_id] = {"id": _book_id, **_book}
 
-# In-memory users storage
-users = [
-    {"username": "user0", "email": "user0@example.com", "password": "pass123"},
-    {"username": "user1", "email": "user1@example.com", "password": "pass123"},
-    {"username": "user2", "email": "user2@example.com", "password": "pass123"}
-]
+# In-memory users storage, indexed by username for O(1) lookups on login
+users = {
+    user["username"]: user
+    for user in [
+        {"username": "user0", "email": "user0@example.com", "password": "pass123"},
+        {"username": "user1", "email": "user1@example.com", "password": "pass123"},
+        {"username": "user2", "email": "user2@example.com", "password": "pass123"}
+    ]
+}
 
 # Pydantic models
 class Book(BaseModel):
     title: str
     author: str
 
+class BookRead(Book):
+    id: int
+
 class LoginData(BaseModel):
     username: str
     password: str
 
+# Cache of already verified tokens
+class TokenCache:
+    """
+    Bounded LRU cache of verified JWT payloads, keyed by the SHA-256 digest of the token.
+    Entries are only served while the token's `exp` is in the future, so expiry checks
+    are never weakened: an expired entry is dropped and the token goes through jwt.decode again.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # digest -> (exp, payload)
+        self._lock = Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                exp, payload = entry
+                if time.time() < exp:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, payload: dict):
+        exp = payload.get("exp")
+        if exp is None:
+            return  # Without exp we cannot know when to evict it, so it is not cached
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (exp, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+token_cache = TokenCache()
+
+# Deny-list of revoked tokens (filled by /logout and /revoke, checked in verify_token)
+class BloomFilter:
+    """
+    Fixed-size bit array sized for `expected_items` keys at the given false positive rate.
+    A miss means the jti was never revoked; a hit still has to be confirmed in the exact dict.
+    """
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.01):
+        expected_items = max(expected_items, 1)
+        self.size = max(8, int(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.size / expected_items * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing: k positions derived from a single digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str):
+        return all(self._bits[position >> 3] >> (position & 7) & 1 for position in self._positions(key))
+
+class TokenDenyList:
+    """
+    jti -> exp of every revoked token that has not expired yet.
+    Most requests carry a token that was never revoked, so is_revoked() usually stops at the
+    Bloom filter. Every `purge_interval` seconds the expired jtis are dropped and the filter is
+    rebuilt from the remaining ones, which keeps both bounded by the tokens still in use.
+    """
+
+    def __init__(self, expected_items: int = 10_000, false_positive_rate: float = 0.01, purge_interval: int = 60):
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.purge_interval = purge_interval
+        self._revoked = {}  # jti -> exp (timestamp)
+        self._bloom = BloomFilter(expected_items, false_positive_rate)
+        self._next_purge = time.time() + purge_interval
+        self._lock = Lock()
+
+    def _purge(self, now: float):
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        bloom = BloomFilter(max(self.expected_items, 2 * len(self._revoked)), self.false_positive_rate)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._next_purge = now + self.purge_interval
+
+    def revoke(self, jti: str, exp: float):
+        now = time.time()
+        if exp <= now:
+            return  # Already expired: nothing to remember
+        with self._lock:
+            if now >= self._next_purge or len(self._revoked) >= 2 * self.expected_items:
+                self._purge(now)
+            self._revoked[jti] = exp
+            self._bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        exp = self._revoked.get(jti)
+        return exp is not None and exp > time.time()
+
+    def __len__(self):
+        return len(self._revoked)
+
+deny_list = TokenDenyList()
+
+def revoke_token(payload: dict) -> bool:
+    """Revoke a token until it expires. Tokens without jti or exp (e.g. issued before revocation existed) cannot be revoked."""
+    jti, exp = payload.get("jti"), payload.get("exp")
+    if not jti or exp is None:
+        return False
+    deny_list.revoke(jti, exp)
+    return True
+
 # Helper function to decode JWT
 def decode_jwt(token: str):
     try:
@@ -49,38 +210,72 @@ def decode_jwt(token: str):
 
 # Dependency to verify JWT
 def verify_token(token: str = Depends(oauth2_scheme)):
-    return decode_jwt(token)
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_jwt(token)
+        token_cache.put(token, payload)
+    # Checked on every request (also on cache hits) so a revoked token stops working immediately
+    jti = payload.get("jti")
+    if jti and deny_list.is_revoked(jti):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return payload
 
 # Endpoints
 @app.post("/login")
 def login(data: LoginData):
-    user = next((u for u in users if u["username"] == data.username and u["password"] == data.password), None)
-    if user:
+    user = users.get(data.username)
+    if user and user["password"] == data.password:
         expiration = datetime.now() + timedelta(minutes=5) # Token valid for 5 minutes
-        token = jwt.encode({"username": user["username"], "exp": expiration}, SECRET_KEY, algorithm="HS256")
+        token = jwt.encode({"username": user["username"], "exp": expiration, "jti": uuid4().hex}, SECRET_KEY, algorithm="HS256")
         return {"access_token": token, "token_type": "bearer"}
     raise HTTPException(status_code=401, detail="Invalid credentials")
 
-@app.get("/books", response_model=List[Book])
+@app.post("/logout")
+def logout(token: dict = Depends(verify_token)):
+    if not revoke_token(token):
+        raise HTTPException(status_code=400, detail="Token cannot be revoked")
+    return {"message": "Logged out successfully"}
+
+@app.post("/revoke")
+def revoke(revoked_token: str = Body(..., embed=True), token: dict = Depends(verify_token)):
+    payload = decode_jwt(revoked_token)
+    if payload.get("username") != token.get("username"):
+        raise HTTPException(status_code=403, detail="You can only revoke your own tokens")
+    if not revoke_token(payload):
+        raise HTTPException(status_code=400, detail="Token cannot be revoked")
+    return {"message": "Token revoked successfully"}
+
+@app.get("/token-cache/stats")
+def get_token_cache_stats():
+    return token_cache.stats()
+
+@app.get("/books", response_model=List[BookRead])
 def get_books(token: dict = Depends(verify_token)):
-    return books
+    return list(books.values())
+
+@app.get("/books/{book_id}", response_model=BookRead)
+def get_book(book_id: int, token: dict = Depends(verify_token)):
+    book = books.get(book_id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return book
 
 @app.post("/books")
 def add_book(book: Book, token: dict = Depends(verify_token)):
-    books.append(book)
-    return {"message": "Book added successfully"}
+    book_id = next(book_ids)
+    books[book_id] = {"id": book_id, **book.model_dump()}
+    return {"message": "Book added successfully", "id": book_id}
 
-@app.put("/books")
-def update_book(index: int, book: Book, token: dict = Depends(verify_token)):
-    if 0 <= index < len(books):
-        books[index] = book
+@app.put("/books/{book_id}")
+def update_book(book_id: int, book: Book, token: dict = Depends(verify_token)):
+    if book_id in books:
+        books[book_id] = {"id": book_id, **book.model_dump()}
         return {"message": "Book updated successfully"}
     raise HTTPException(status_code=404, detail="Book not found")
 
-@app.delete("/books")
-def delete_book(index: int, token: dict = Depends(verify_token)):
-    if 0 <= index < len(books):
-        books.pop(index)
+@app.delete("/books/{book_id}")
+def delete_book(book_id: int, token: dict = Depends(verify_token)):
+    if books.pop(book_id, None) is not None:
         return {"message": "Book deleted successfully"}
     raise HTTPException(status_code=404, detail="Book not found")
 
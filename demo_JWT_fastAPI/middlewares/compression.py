@@ -0,0 +1,152 @@
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# brotli y zstandard son opcionales: si no están instalados solo se negocia gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Solo se comprimen formatos de texto; imágenes, vídeos o archivos ya comprimidos se envían tal cual
+COMPRESSIBLE_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+def gzip_compressor(level: int = 6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: formato gzip
+    def compress(chunk: bytes, final: bool) -> bytes:
+        return compressor.compress(chunk) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+    return compress
+
+def brotli_compressor(level: int = 4):
+    compressor = brotli.Compressor(quality=level)
+    def compress(chunk: bytes, final: bool) -> bytes:
+        return compressor.process(chunk) + (compressor.finish() if final else compressor.flush())
+    return compress
+
+def zstd_compressor(level: int = 3):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    def compress(chunk: bytes, final: bool) -> bytes:
+        mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return compressor.compress(chunk) + compressor.flush(mode)
+    return compress
+
+# Codificaciones disponibles en orden de preferencia del servidor (se usa en caso de empate de q)
+ENCODERS = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = zstd_compressor
+if brotli is not None:
+    ENCODERS["br"] = brotli_compressor
+ENCODERS["gzip"] = gzip_compressor
+
+def choose_encoding(accept_encoding: str):
+    """Elige la codificación con mayor q de Accept-Encoding entre las disponibles (None si ninguna)."""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in ENCODERS:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI puro que comprime las respuestas con zstd, brotli o gzip según Accept-Encoding.
+
+    Solo se comprimen los tipos de `content_types` y las respuestas de al menos `minimum_size`
+    bytes (comprimir respuestas pequeñas cuesta más CPU de lo que ahorra). Las respuestas en
+    streaming (`StreamingResponse`) se comprimen trozo a trozo y cada trozo se envía en cuanto
+    llega, sin esperar al final. Las respuestas que ya traen Content-Encoding (por ejemplo los
+    estáticos precomprimidos) no se tocan.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        content_types: tuple = COMPRESSIBLE_CONTENT_TYPES,
+        levels: dict = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.levels = levels or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compress = None  # None mientras no se sepa si se comprime; False si se envía sin comprimir
+
+        async def compressing_send(message: Message):
+            nonlocal start_message, compress
+            if message["type"] == "http.response.start":
+                # Se retiene la cabecera hasta ver el primer trozo del cuerpo
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or not content_type.startswith(self.content_types)
+                ):
+                    compress = False
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or compress is False:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compress is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    # Respuesta completa y pequeña: no compensa comprimirla
+                    compress = False
+                    await send(start_message)
+                    await send(message)
+                    return
+                compress = ENCODERS[encoding](**({"level": self.levels[encoding]} if encoding in self.levels else {}))
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    # Streaming: no se conoce la longitud final
+                    del headers["Content-Length"]
+                else:
+                    body = compress(body, True)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+
+            await send({"type": "http.response.body", "body": compress(body, not more_body), "more_body": more_body})
+
+        await self.app(scope, receive, compressing_send)
@@ -1,57 +1,60 @@
-from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.author import Author
 
-def create_author(session: Session, author: Author):
-    existing_author = session.exec(select(Author).where(Author.email == author.email)).first()
+async def create_author(session: AsyncSession, author: Author):
+    existing_author = (await session.exec(select(Author).where(Author.email == author.email))).first()
     if existing_author:
         raise ValueError(f"An author with email '{author.email}' already exists.")
     session.add(author)
-    session.commit()
-    session.refresh(author)
+    await session.commit()
+    await session.refresh(author)
     return author
 
-def get_authors(session: Session):
-    return session.exec(select(Author)).all()
+async def get_authors(session: AsyncSession):
+    return (await session.exec(select(Author))).all()
 
-def get_author_by_id(session: Session, author_id: int):
-    return session.get(Author, author_id)
+async def get_author_by_id(session: AsyncSession, author_id: int):
+    return await session.get(Author, author_id)
 
-def get_author_by_name(session: Session, name: str):
+async def get_author_by_name(session: AsyncSession, name: str):
     statement = select(Author).where(Author.name == name)
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
-def update_author(session: Session, author_id: int, author_data: dict):
-    author = session.get(Author, author_id)
+async def update_author(session: AsyncSession, author_id: int, author_data: dict):
+    author = await session.get(Author, author_id)
     if not author:
         return None
     for key, value in author_data.items():
         setattr(author, key, value)
-    session.commit()
-    session.refresh(author)
+    await session.commit()
+    await session.refresh(author)
     return author
 
-def update_author_by_name(session: Session, name: str, author_data: dict):
+async def update_author_by_name(session: AsyncSession, name: str, author_data: dict):
     statement = select(Author).where(Author.name == name)
-    author = session.exec(statement).first()
+    author = (await session.exec(statement)).first()
     if not author:
         return None
     for key, value in author_data.items():
         setattr(author, key, value)
-    session.commit()
-    session.refresh(author)
+    await session.commit()
+    await session.refresh(author)
     return author
 
-def delete_author(session: Session, author_id: int):
-    author = session.get(Author, author_id)
+async def delete_author(session: AsyncSession, author_id: int):
+    # Al borrar, SQLAlchemy recorre author.entries: se carga antes porque en async no hay carga perezosa
+    author = await session.get(Author, author_id, options=[selectinload(Author.entries)])
     if author:
-        session.delete(author)
-        session.commit()
+        await session.delete(author)
+        await session.commit()
     return author
 
-def delete_author_by_name(session: Session, name: str):
-    statement = select(Author).where(Author.name == name)
-    author = session.exec(statement).first()
+async def delete_author_by_name(session: AsyncSession, name: str):
+    statement = select(Author).where(Author.name == name).options(selectinload(Author.entries))
+    author = (await session.exec(statement)).first()
     if author:
-        session.delete(author)
-        session.commit()
-    return author
\ No newline at end of file
+        await session.delete(author)
+        await session.commit()
+    return author
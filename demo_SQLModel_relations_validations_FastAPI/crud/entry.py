@@ -1,66 +1,72 @@
-from sqlmodel import Session, select
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.entry import Entry
 from models.author import Author
 from crud.author import get_author_by_name
 
-def create_entry(session: Session, entry: Entry):
-    existing_entry = session.exec(select(Entry).where(Entry.title == entry.title)).first()
+# Con AsyncSession no hay carga perezosa de relaciones: toda consulta cuyo resultado se
+# devuelve como EntryRead (que incluye el autor) lo carga explícitamente
+
+async def create_entry(session: AsyncSession, entry: Entry):
+    existing_entry = (await session.exec(select(Entry).where(Entry.title == entry.title))).first()
     if existing_entry:
         raise ValueError(f"An entry with title '{entry.title}' already exists.")
     session.add(entry)
-    session.commit()
-    session.refresh(entry)
+    await session.commit()
+    await session.refresh(entry, ["author"])
     return entry
 
-def get_entries(session: Session):
-    return session.exec(select(Entry)).all()
+async def get_entries(session: AsyncSession):
+    # EntryRead incluye el autor: se carga en la misma consulta (JOIN) en lugar de una consulta por entrada
+    return (await session.exec(select(Entry).options(joinedload(Entry.author)))).all()
 
-def get_entry_by_id(session: Session, entry_id: int):
-    return session.get(Entry, entry_id)
+async def get_entry_by_id(session: AsyncSession, entry_id: int):
+    return await session.get(Entry, entry_id, options=[joinedload(Entry.author)])
 
-def get_entry_by_title(session: Session, title: str):
-    statement = select(Entry).where(Entry.title == title)
-    return session.exec(statement).first()
+async def get_entry_by_title(session: AsyncSession, title: str):
+    statement = select(Entry).where(Entry.title == title).options(joinedload(Entry.author))
+    return (await session.exec(statement)).first()
 
-def update_entry(session: Session, entry_id: int, entry_data: dict):
-    entry = session.get(Entry, entry_id)
+async def update_entry(session: AsyncSession, entry_id: int, entry_data: dict):
+    entry = await session.get(Entry, entry_id)
     if not entry:
         return None
     for key, value in entry_data.items():
         setattr(entry, key, value)
-    session.commit()
-    session.refresh(entry)
+    await session.commit()
+    await session.refresh(entry)
     return entry
 
-def update_entry_by_title(session: Session, title: str, entry_data: dict):
+async def update_entry_by_title(session: AsyncSession, title: str, entry_data: dict):
     statement = select(Entry).where(Entry.title == title)
-    entry = session.exec(statement).first()
+    entry = (await session.exec(statement)).first()
     if not entry:
         return None
     for key, value in entry_data.items():
         setattr(entry, key, value)
-    session.commit()
-    session.refresh(entry)
+    await session.commit()
+    await session.refresh(entry)
     return entry
 
-def delete_entry(session: Session, entry_id: int):
-    entry = session.get(Entry, entry_id)
+async def delete_entry(session: AsyncSession, entry_id: int):
+    entry = await session.get(Entry, entry_id)
     if entry:
-        session.delete(entry)
-        session.commit()
+        await session.delete(entry)
+        await session.commit()
     return entry
 
-def delete_entry_by_title(session: Session, title: str):
+async def delete_entry_by_title(session: AsyncSession, title: str):
     statement = select(Entry).where(Entry.title == title)
-    entry = session.exec(statement).first()
+    entry = (await session.exec(statement)).first()
     if entry:
-        session.delete(entry)
-        session.commit()
+        await session.delete(entry)
+        await session.commit()
     return entry
 
-def get_entries_by_author_name(session: Session, author_name: str):
-    author = get_author_by_name(session, author_name)
+async def get_entries_by_author_name(session: AsyncSession, author_name: str):
+    author = await get_author_by_name(session, author_name)
     if not author:
         return []
-    statement = select(Entry).where(Entry.author_id == author.id)
-    return session.exec(statement).all()
\ No newline at end of file
+    statement = select(Entry).where(Entry.author_id == author.id).options(joinedload(Entry.author))
+    return (await session.exec(statement)).all()
@@ -1,14 +1,31 @@
-from sqlmodel import SQLModel, create_engine, Session
+import os
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 DATABASE_URL = "sqlite:///./test.db"
+# Mismo fichero a través de aiosqlite: lo usan las rutas de la API
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+
+# Motor síncrono: solo para scripts (seeder.py) y para crear o borrar las tablas
 engine = create_engine(DATABASE_URL, echo=True)
 
+# Motor asíncrono: mientras una petición espera a la base de datos no ocupa ningún hilo del
+# threadpool de FastAPI, así que la concurrencia la limita el pool de conexiones (pool_size + max_overflow)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=True,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+)
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 def drop_db_and_tables():
     SQLModel.metadata.drop_all(engine)
 
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+async def get_session():
+    # expire_on_commit=False: tras el commit los objetos se serializan sin volver a consultar la base de datos
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
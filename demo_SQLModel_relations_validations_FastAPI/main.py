@@ -3,10 +3,14 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from db.database import create_db_and_tables
 from routes import author, entry
+from middlewares.compression import CompressionMiddleware
 import uvicorn
 
 app = FastAPI()
 
+# Comprime con zstd, brotli o gzip las respuestas JSON de más de 500 bytes (por ejemplo /api/entries)
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
 # Crea la base de datos y las tablas al iniciar la aplicación
 @asynccontextmanager
 async def on_startup():
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from db.database import get_session
 from models.author import Author, AuthorCreate
 from crud.author import (
@@ -16,26 +16,26 @@ from crud.author import (
 router = APIRouter()
 
 @router.post("/", response_model=Author)
-def create(author: AuthorCreate, session: Session = Depends(get_session)):
+async def create(author: AuthorCreate, session: AsyncSession = Depends(get_session)):
     try:
         author_data = Author(**author.model_dump())
-        return create_author(session, author_data)
+        return await create_author(session, author_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.get("/", response_model=list[Author])
-def read_all(session: Session = Depends(get_session)):
+async def read_all(session: AsyncSession = Depends(get_session)):
     try:
-        return get_authors(session)
+        return await get_authors(session)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.get("/{author_id}", response_model=Author)
-def read(author_id: int, session: Session = Depends(get_session)):
+async def read(author_id: int, session: AsyncSession = Depends(get_session)):
     try:
-        author = get_author_by_id(session, author_id)
+        author = await get_author_by_id(session, author_id)
         if not author:
             raise HTTPException(status_code=404, detail=f"Author with ID {author_id} not found")
         return author
@@ -43,9 +43,9 @@ def read(author_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.get("/name/{name}", response_model=Author)
-def read_by_name(name: str, session: Session = Depends(get_session)):
+async def read_by_name(name: str, session: AsyncSession = Depends(get_session)):
     try:
-        author = get_author_by_name(session, name)
+        author = await get_author_by_name(session, name)
         if not author:
             raise HTTPException(status_code=404, detail=f"Author with name '{name}' not found")
         return author
@@ -53,7 +53,7 @@ def read_by_name(name: str, session: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.put("/{author_id}", response_model=Author)
-def update(
+async def update(
     author_id: int,
     author_data: dict = Body(
         ...,
@@ -62,10 +62,10 @@ def update(
             "email": "updated_email@example.com"
         }
     ),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     try:
-        updated_author = update_author(session, author_id, author_data)
+        updated_author = await update_author(session, author_id, author_data)
         if not updated_author:
             raise HTTPException(status_code=404, detail=f"Author with ID {author_id} not found")
         return updated_author
@@ -73,7 +73,7 @@ def update(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.put("/name/{name}", response_model=Author)
-def update_by_name(
+async def update_by_name(
     name: str,
     author_data: dict = Body(
         ...,
@@ -82,10 +82,10 @@ def update_by_name(
             "email": "updated_email@example.com"
         }
     ),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     try:
-        updated_author = update_author_by_name(session, name, author_data)
+        updated_author = await update_author_by_name(session, name, author_data)
         if not updated_author:
             raise HTTPException(status_code=404, detail=f"Author with name '{name}' not found")
         return updated_author
@@ -93,9 +93,9 @@ def update_by_name(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.delete("/{author_id}", response_model=Author)
-def delete(author_id: int, session: Session = Depends(get_session)):
+async def delete(author_id: int, session: AsyncSession = Depends(get_session)):
     try:
-        deleted_author = delete_author(session, author_id)
+        deleted_author = await delete_author(session, author_id)
         if not deleted_author:
             raise HTTPException(status_code=404, detail=f"Author with ID {author_id} not found")
         return deleted_author
@@ -103,9 +103,9 @@ def delete(author_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.delete("/name/{name}", response_model=Author)
-def delete_by_name(name: str, session: Session = Depends(get_session)):
+async def delete_by_name(name: str, session: AsyncSession = Depends(get_session)):
     try:
-        deleted_author = delete_author_by_name(session, name)
+        deleted_author = await delete_author_by_name(session, name)
         if not deleted_author:
             raise HTTPException(status_code=404, detail=f"Author with name '{name}' not found")
         return deleted_author
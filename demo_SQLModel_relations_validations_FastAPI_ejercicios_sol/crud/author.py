@@ -1,61 +1,65 @@
-from sqlmodel import Session, select, join
+from sqlalchemy.orm import selectinload
+from sqlmodel import select, join
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.author import Author
-from datetime import datetime, timezone
+from models.timestamps import utc_now
+from crud.pagination import keyset_paginate
 
-def create_author(session: Session, author: Author):
-    existing_author = session.exec(select(Author).where(Author.email == author.email)).first()
+async def create_author(session: AsyncSession, author: Author):
+    existing_author = (await session.exec(select(Author).where(Author.email == author.email))).first()
     if existing_author:
         raise ValueError(f"An author with email '{author.email}' already exists.")
     session.add(author)
-    session.commit()
-    session.refresh(author)
+    await session.commit()
+    await session.refresh(author)
     return author
 
-def get_authors(session: Session, limit: int = 10, offset: int = 0):
-    statement = select(Author).where(Author.is_deleted == False).limit(limit).offset(offset)
-    return session.exec(statement).all()
+async def get_authors(session: AsyncSession, limit: int = 10, cursor: str = None, order_by: str = "id"):
+    statement = select(Author).where(Author.is_deleted == False)
+    return await keyset_paginate(session, statement, Author, order_by, limit, cursor)
 
-def get_author_by_id(session: Session, author_id: int):
-    author = session.get(Author, author_id)
+async def get_author_by_id(session: AsyncSession, author_id: int):
+    author = await session.get(Author, author_id)
     return author if author and not author.is_deleted else None
 
-def get_author_by_name(session: Session, name: str):
+async def get_author_by_name(session: AsyncSession, name: str):
     statement = select(Author).where(Author.name == name, Author.is_deleted == False)
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
-def update_author(session: Session, author_id: int, author_data: dict):
-    author = session.get(Author, author_id)
+async def update_author(session: AsyncSession, author_id: int, author_data: dict):
+    author = await session.get(Author, author_id)
     if not author:
         return None
     for key, value in author_data.items():
         setattr(author, key, value)
-    author.updated_at = datetime.now(timezone.utc)  # Update the timestamp
-    session.commit()
-    session.refresh(author)
+    author.updated_at = utc_now()  # Update the timestamp
+    await session.commit()
+    await session.refresh(author)
     return author
 
-def update_author_by_name(session: Session, name: str, author_data: dict):
+async def update_author_by_name(session: AsyncSession, name: str, author_data: dict):
     statement = select(Author).where(Author.name == name)
-    author = session.exec(statement).first()
+    author = (await session.exec(statement)).first()
     if not author:
         return None
     for key, value in author_data.items():
         setattr(author, key, value)
-    session.commit()
-    session.refresh(author)
+    await session.commit()
+    await session.refresh(author)
     return author
 
-def delete_author(session: Session, author_id: int):
-    author = session.get(Author, author_id)
+async def delete_author(session: AsyncSession, author_id: int):
+    author = await session.get(Author, author_id)
     if author and not author.is_deleted:
         author.is_deleted = True
-        session.commit()
+        await session.commit()
     return author
 
-def delete_author_by_name(session: Session, name: str):
-    statement = select(Author).where(Author.name == name)
-    author = session.exec(statement).first()
+async def delete_author_by_name(session: AsyncSession, name: str):
+    # Al borrar, SQLAlchemy recorre author.entries: se carga antes porque en async no hay carga perezosa
+    statement = select(Author).where(Author.name == name).options(selectinload(Author.entries))
+    author = (await session.exec(statement)).first()
     if author:
-        session.delete(author)
-        session.commit()
+        await session.delete(author)
+        await session.commit()
     return author
\ No newline at end of file
@@ -1,24 +1,27 @@
-from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.category import Category
 
-def create_category(session: Session, category: Category):
-    existing_category = session.exec(select(Category).where(Category.name == category.name)).first()
+async def create_category(session: AsyncSession, category: Category):
+    existing_category = (await session.exec(select(Category).where(Category.name == category.name))).first()
     if existing_category:
         raise ValueError(f"A category with name '{category.name}' already exists.")
     session.add(category)
-    session.commit()
-    session.refresh(category)
+    await session.commit()
+    await session.refresh(category)
     return category
 
-def get_categories(session: Session):
-    return session.exec(select(Category)).all()
+async def get_categories(session: AsyncSession):
+    return (await session.exec(select(Category))).all()
 
-def get_category_by_id(session: Session, category_id: int):
-    return session.get(Category, category_id)
+async def get_category_by_id(session: AsyncSession, category_id: int):
+    return await session.get(Category, category_id)
 
-def delete_category(session: Session, category_id: int):
-    category = session.get(Category, category_id)
+async def delete_category(session: AsyncSession, category_id: int):
+    # Al borrar, SQLAlchemy recorre category.entries: se carga antes porque en async no hay carga perezosa
+    category = await session.get(Category, category_id, options=[selectinload(Category.entries)])
     if category:
-        session.delete(category)
-        session.commit()
+        await session.delete(category)
+        await session.commit()
     return category
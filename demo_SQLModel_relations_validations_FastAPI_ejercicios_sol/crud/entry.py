@@ -1,75 +1,82 @@
-from sqlmodel import Session, select, join
-from datetime import datetime
+from sqlalchemy.orm import contains_eager, joinedload
+from sqlmodel import select, join
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.timestamps import utc_now
 from models.entry import Entry
 from models.author import Author
 from crud.author import get_author_by_name
+from crud.pagination import keyset_paginate
 
-def create_entry(session: Session, entry: Entry):
-    existing_entry = session.exec(select(Entry).where(Entry.title == entry.title)).first()
+# Con AsyncSession no hay carga perezosa de relaciones: toda consulta cuyo resultado se
+# devuelve como EntryRead (que incluye el autor) lo carga explícitamente
+
+async def create_entry(session: AsyncSession, entry: Entry):
+    existing_entry = (await session.exec(select(Entry).where(Entry.title == entry.title))).first()
     if existing_entry:
         raise ValueError(f"An entry with title '{entry.title}' already exists.")
     session.add(entry)
-    session.commit()
-    session.refresh(entry)
+    await session.commit()
+    await session.refresh(entry, ["author"])
     return entry
 
-def get_entries(session: Session, limit: int = 10, offset: int = 0, order_by: str = None):
-    statement = select(Entry).where(Entry.is_deleted == False).limit(limit).offset(offset)
-    if order_by:
-        statement = statement.order_by(getattr(Entry, order_by))
-    return session.exec(statement).all()
+async def get_entries(session: AsyncSession, limit: int = 10, cursor: str = None, order_by: str = "id"):
+    # EntryRead incluye el autor: se carga en la misma consulta (JOIN) en lugar de una consulta por entrada
+    statement = select(Entry).where(Entry.is_deleted == False).options(joinedload(Entry.author))
+    return await keyset_paginate(session, statement, Entry, order_by, limit, cursor)
 
-def get_entry_by_id(session: Session, entry_id: int):
-    entry = session.get(Entry, entry_id)
+async def get_entry_by_id(session: AsyncSession, entry_id: int):
+    entry = await session.get(Entry, entry_id, options=[joinedload(Entry.author)])
     return entry if entry and not entry.is_deleted else None
 
-def get_entry_by_title(session: Session, title: str):
-    statement = select(Entry).where(Entry.title == title, Entry.is_deleted == False)
-    return session.exec(statement).first()
+async def get_entry_by_title(session: AsyncSession, title: str):
+    statement = select(Entry).where(Entry.title == title, Entry.is_deleted == False).options(joinedload(Entry.author))
+    return (await session.exec(statement)).first()
 
-def update_entry(session: Session, entry_id: int, entry_data: dict):
-    entry = session.get(Entry, entry_id)
+async def update_entry(session: AsyncSession, entry_id: int, entry_data: dict):
+    entry = await session.get(Entry, entry_id)
     if not entry or entry.is_deleted:
         return None
     for key, value in entry_data.items():
         setattr(entry, key, value)
-    entry.updated_at = datetime.utcnow()  # Manually update the timestamp
-    session.commit()
-    session.refresh(entry)
+    entry.updated_at = utc_now()  # Manually update the timestamp
+    await session.commit()
+    await session.refresh(entry)
     return entry
 
-def update_entry_by_title(session: Session, title: str, entry_data: dict):
+async def update_entry_by_title(session: AsyncSession, title: str, entry_data: dict):
     statement = select(Entry).where(Entry.title == title, Entry.is_deleted == False)
-    entry = session.exec(statement).first()
+    entry = (await session.exec(statement)).first()
     if not entry:
         return None
     for key, value in entry_data.items():
         setattr(entry, key, value)
-    session.commit()
-    session.refresh(entry)
+    await session.commit()
+    await session.refresh(entry)
     return entry
 
-def delete_entry(session: Session, entry_id: int):
-    entry = session.get(Entry, entry_id)
+async def delete_entry(session: AsyncSession, entry_id: int):
+    entry = await session.get(Entry, entry_id)
     if entry and not entry.is_deleted:
         entry.is_deleted = True
-        session.commit()
+        await session.commit()
     return entry
 
-def delete_entry_by_title(session: Session, title: str):
+async def delete_entry_by_title(session: AsyncSession, title: str):
     statement = select(Entry).where(Entry.title == title, Entry.is_deleted == False)
-    entry = session.exec(statement).first()
+    entry = (await session.exec(statement)).first()
     if entry:
         entry.is_deleted = True
-        session.commit()
+        await session.commit()
     return entry
 
-def get_entries_by_author_name(session: Session, author_name: str, order_by: str = None):
+async def get_entries_by_author_name(session: AsyncSession, author_name: str, order_by: str = None):
     statement = (
         select(Entry)
         .join(Author, Entry.author_id == Author.id)
         .where(Author.name == author_name, Entry.is_deleted == False, Author.is_deleted == False)
+        # Reutiliza el JOIN del filtro para rellenar entry.author sin más consultas
+        .options(contains_eager(Entry.author))
     )
     if order_by:
         statement = statement.order_by(getattr(Entry, order_by))
-    return session.exec(statement).all()
\ No newline at end of file
+    return (await session.exec(statement)).all()
\ No newline at end of file
@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+def encode_cursor(order_by: str, value, row_id: int) -> str:
+    """Cursor opaco con la última (clave de orden, id) devuelta."""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"o": order_by, "k": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, order_by: str):
+    """Devuelve (valor, id) del cursor. Lanza ValueError si el cursor no es válido o es de otro orden."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        value, row_id = payload["k"], int(payload["id"])
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if payload.get("o") != order_by:
+        raise ValueError(f"The cursor was created for order_by='{payload.get('o')}', not '{order_by}'.")
+    return value, row_id
+
+async def keyset_paginate(session: AsyncSession, statement, model, order_by: str, limit: int, cursor: str = None):
+    """
+    Paginación por cursor (keyset): en lugar de saltar `offset` filas, continúa a partir de la
+    última (clave de orden, id) vista con WHERE (clave, id) > (último valor, último id).
+    Con un índice compuesto que termine en (clave, id) la base de datos salta directamente a
+    esa posición, así que cualquier página cuesta lo mismo que la primera.
+    Devuelve (filas, next_cursor); next_cursor es None en la última página.
+    """
+    key = getattr(model, order_by)
+    if cursor:
+        value, row_id = decode_cursor(cursor, order_by)
+        if order_by == "id":
+            statement = statement.where(model.id > row_id)
+        else:
+            statement = statement.where(tuple_(key, model.id) > tuple_(value, row_id))
+    order = (model.id,) if order_by == "id" else (key, model.id)
+    # Se pide una fila de más para saber si hay otra página sin hacer un COUNT
+    rows = (await session.exec(statement.order_by(*order).limit(limit + 1))).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(order_by, getattr(last, order_by), last.id)
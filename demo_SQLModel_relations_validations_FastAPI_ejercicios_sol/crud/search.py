@@ -0,0 +1,240 @@
+import html
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import contains_eager
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.author import Author
+from models.entry import Entry
+
+# Índice de búsqueda de texto completo de las entradas (título, contenido y nombre del autor).
+# - SQLite: tabla virtual FTS5 `entry_fts` mantenida con triggers.
+# - PostgreSQL: columna `entry.search_vector` (tsvector) mantenida con triggers e índice GIN.
+# Los triggers actualizan el índice en cada alta, modificación, borrado lógico (is_deleted)
+# de la entrada o de su autor y cambio de nombre del autor, también si la fila se modifica
+# fuera de la aplicación. Las entradas de un autor borrado no aparecen en las búsquedas.
+
+# Marcadores temporales para los resaltados: se escapa el HTML y después se cambian por <mark>
+HIGHLIGHT_START, HIGHLIGHT_STOP = "\ue000", "\ue001"  # Caracteres de uso privado de Unicode
+
+SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS entry_fts USING fts5(
+        title, content, author_name, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entry_fts_insert AFTER INSERT ON entry WHEN NEW.is_deleted = 0 BEGIN
+        INSERT INTO entry_fts (rowid, title, content, author_name)
+        SELECT NEW.id, NEW.title, NEW.content, author.name
+        FROM author WHERE author.id = NEW.author_id AND author.is_deleted = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entry_fts_update AFTER UPDATE OF title, content, author_id, is_deleted ON entry BEGIN
+        DELETE FROM entry_fts WHERE rowid = OLD.id;
+        INSERT INTO entry_fts (rowid, title, content, author_name)
+        SELECT NEW.id, NEW.title, NEW.content, author.name
+        FROM author WHERE author.id = NEW.author_id AND author.is_deleted = 0 AND NEW.is_deleted = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entry_fts_delete AFTER DELETE ON entry BEGIN
+        DELETE FROM entry_fts WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS author_fts_update AFTER UPDATE OF name ON author BEGIN
+        UPDATE entry_fts SET author_name = NEW.name
+        WHERE rowid IN (SELECT id FROM entry WHERE author_id = NEW.id AND is_deleted = 0);
+    END
+    """,
+    # Borrado lógico del autor: sus entradas salen del índice, y vuelven si se restaura
+    """
+    CREATE TRIGGER IF NOT EXISTS author_fts_soft_delete AFTER UPDATE OF is_deleted ON author BEGIN
+        DELETE FROM entry_fts WHERE rowid IN (SELECT id FROM entry WHERE author_id = NEW.id);
+        INSERT INTO entry_fts (rowid, title, content, author_name)
+        SELECT entry.id, entry.title, entry.content, NEW.name
+        FROM entry WHERE entry.author_id = NEW.id AND entry.is_deleted = 0 AND NEW.is_deleted = 0;
+    END
+    """,
+]
+
+# Triggers cuya definición ha cambiado: se vuelven a crear en las bases de datos existentes
+SQLITE_REPLACED_TRIGGERS = ["entry_fts_insert", "entry_fts_update"]
+
+SQLITE_BACKFILL = """
+    INSERT INTO entry_fts (rowid, title, content, author_name)
+    SELECT entry.id, entry.title, entry.content, author.name
+    FROM entry JOIN author ON author.id = entry.author_id
+    WHERE entry.is_deleted = 0 AND author.is_deleted = 0
+"""
+
+SQLITE_LIVE_COUNT = """
+    SELECT count(*) FROM entry JOIN author ON author.id = entry.author_id
+    WHERE entry.is_deleted = 0 AND author.is_deleted = 0
+"""
+
+# Pesos: título (A) > nombre del autor (B) > contenido (C)
+POSTGRES_SETUP = [
+    "ALTER TABLE entry ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION entry_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce((SELECT name FROM author WHERE id = NEW.author_id), '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.content, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS entry_search_vector_trigger ON entry",
+    """
+    CREATE TRIGGER entry_search_vector_trigger BEFORE INSERT OR UPDATE OF title, content, author_id ON entry
+    FOR EACH ROW EXECUTE FUNCTION entry_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION author_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE entry SET title = title WHERE author_id = NEW.id;  -- Recalcula search_vector
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS author_search_vector_trigger ON author",
+    """
+    CREATE TRIGGER author_search_vector_trigger AFTER UPDATE OF name ON author
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name) EXECUTE FUNCTION author_search_vector_update()
+    """,
+    # Índice parcial: las entradas borradas (is_deleted) no ocupan sitio ni aparecen en las búsquedas
+    "CREATE INDEX IF NOT EXISTS ix_entry_search_vector ON entry USING GIN (search_vector) WHERE is_deleted = false",
+    "UPDATE entry SET title = title WHERE search_vector IS NULL",
+]
+
+def create_search_index(engine):
+    """Crea el índice de texto completo y sus triggers si no existen, y lo rellena con las entradas actuales."""
+    with engine.begin() as connection:
+        if engine.dialect.name == "postgresql":
+            for statement in POSTGRES_SETUP:
+                connection.execute(text(statement))
+        elif engine.dialect.name == "sqlite":
+            for trigger in SQLITE_REPLACED_TRIGGERS:
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            for statement in SQLITE_SETUP:
+                connection.execute(text(statement))
+            # Rellena el índice con las entradas existentes: al crearlo, o si las filas se
+            # escribieron sin los triggers (por ejemplo, en una base de datos anterior al índice)
+            indexed = connection.execute(text("SELECT count(*) FROM entry_fts")).scalar()
+            live = connection.execute(text(SQLITE_LIVE_COUNT)).scalar()
+            if indexed != live:
+                connection.execute(text("DELETE FROM entry_fts"))
+                connection.execute(text(SQLITE_BACKFILL))
+
+def drop_search_index(engine):
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS entry_fts"))
+
+def _terms(value: str):
+    # Solo palabras: así el texto del usuario nunca se interpreta como sintaxis de FTS5 o tsquery
+    return re.findall(r"\w+", value.lower()) if value else []
+
+def _sqlite_query(q, title, content, author_name):
+    parts = []
+    for column, value in ((None, q), ("title", title), ("content", content), ("author_name", author_name)):
+        terms = _terms(value)
+        if terms:
+            expression = " AND ".join(f'"{term}"*' for term in terms)
+            parts.append(f"({expression})" if column is None else f"{column} : ({expression})")
+    return " AND ".join(parts)
+
+def _postgres_query(q, title, content, author_name):
+    parts = []
+    for weight, value in (("", q), ("A", title), ("C", content), ("B", author_name)):
+        parts.extend(f"{term}:*{weight}" for term in _terms(value))
+    return " & ".join(parts)
+
+def _highlight(value: str) -> str:
+    return html.escape(value or "").replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+SQLITE_SEARCH = """
+    SELECT rowid AS id,
+           -bm25(entry_fts, 10.0, 1.0, 5.0) AS rank,
+           highlight(entry_fts, 0, :start, :stop) AS title_highlight,
+           snippet(entry_fts, 1, :start, :stop, '…', 16) AS snippet
+    FROM entry_fts
+    WHERE entry_fts MATCH :query
+    ORDER BY bm25(entry_fts, 10.0, 1.0, 5.0), rowid
+    LIMIT :limit OFFSET :offset
+"""
+
+# Los resaltados (ts_headline) son caros: solo se calculan para las filas de la página
+POSTGRES_SEARCH = """
+    SELECT page.id, page.rank,
+           ts_headline('simple', entry.title, page.query, :title_options) AS title_highlight,
+           ts_headline('simple', entry.content, page.query, :snippet_options) AS snippet
+    FROM (
+        SELECT entry.id, ts_rank_cd(entry.search_vector, query) AS rank, query
+        FROM entry JOIN author ON author.id = entry.author_id, to_tsquery('simple', :query) AS query
+        WHERE entry.is_deleted = false AND author.is_deleted = false AND entry.search_vector @@ query
+        ORDER BY rank DESC, entry.id
+        LIMIT :limit OFFSET :offset
+    ) AS page
+    JOIN entry ON entry.id = page.id
+    ORDER BY page.rank DESC, page.id
+"""
+
+async def search_entries(
+    session: AsyncSession,
+    q: str = None,
+    title: str = None,
+    content: str = None,
+    author_name: str = None,
+    limit: int = 10,
+    page: int = 1,
+):
+    """
+    Busca entradas en el índice de texto completo, ordenadas por relevancia.
+    Cada término busca también por prefijo ("prog" encuentra "programación"); los términos de
+    title / content / author_name solo buscan en ese campo y q busca en todos.
+    Devuelve (resultados, hay_más_páginas); cada resultado es (entry, rank, title_highlight, snippet).
+    Lanza ValueError si no hay ningún término de búsqueda.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        query = _postgres_query(q, title, content, author_name)
+        sql, params = POSTGRES_SEARCH, {
+            "title_options": f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, HighlightAll=true",
+            "snippet_options": f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=30, MinWords=10, MaxFragments=2",
+        }
+    else:
+        query = _sqlite_query(q, title, content, author_name)
+        sql, params = SQLITE_SEARCH, {"start": HIGHLIGHT_START, "stop": HIGHLIGHT_STOP}
+    if not query:
+        raise ValueError("Provide at least one search term.")
+
+    # Se pide una fila de más para saber si hay otra página sin hacer un COUNT
+    rows = (await session.execute(
+        text(sql), {"query": query, "limit": limit + 1, "offset": (page - 1) * limit, **params}
+    )).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Una sola consulta para cargar las entradas de la página con sus autores
+    ids = [row.id for row in rows]
+    entries = {
+        entry.id: entry
+        for entry in (await session.exec(
+            select(Entry)
+            .join(Author, Entry.author_id == Author.id)
+            .where(Entry.id.in_(ids), Entry.is_deleted == False, Author.is_deleted == False)
+            .options(contains_eager(Entry.author))
+        )).unique()
+    }
+    results = [
+        (entries[row.id], row.rank, _highlight(row.title_highlight), _highlight(row.snippet))
+        for row in rows
+        if row.id in entries
+    ]
+    return results, has_more
@@ -1,14 +1,44 @@
-from sqlmodel import SQLModel, create_engine, Session
+import os
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from crud.search import create_search_index, drop_search_index
 
-DATABASE_URL = "sqlite:///./test.db"
+# SQLite por defecto; con PostgreSQL (DATABASE_URL=postgresql://...) la búsqueda usa tsvector + GIN
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+
+# Driver asíncrono de cada base de datos: las rutas de la API usan la misma URL a través de él
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+_url = make_url(DATABASE_URL)
+ASYNC_DATABASE_URL = _url.set(drivername=ASYNC_DRIVERS[_url.get_backend_name()])
+
+# Motor síncrono: solo para scripts (seeder.py) y para crear el esquema y el índice de búsqueda
 engine = create_engine(DATABASE_URL, echo=True)
 
+# Motor asíncrono: mientras una petición espera a la base de datos no ocupa ningún hilo del
+# threadpool de FastAPI, así que la concurrencia la limita el pool de conexiones (pool_size + max_overflow)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=True,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+)
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    # create_all no añade índices nuevos a tablas que ya existen: se crean aquí si faltan
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    # Índice de texto completo de las entradas (FTS5 en SQLite, tsvector en PostgreSQL)
+    create_search_index(engine)
 
 def drop_db_and_tables():
+    drop_search_index(engine)
     SQLModel.metadata.drop_all(engine)
 
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+async def get_session():
+    # expire_on_commit=False: tras el commit los objetos se serializan sin volver a consultar la base de datos
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -5,6 +5,8 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.encoders import jsonable_encoder
 from db.database import create_db_and_tables
+from middlewares.logging import RequestLoggingMiddleware
+from middlewares.compression import CompressionMiddleware
 from routes import author, entry, category
 import uvicorn
 from sqlalchemy.exc import IntegrityError
@@ -23,21 +25,20 @@ logger = logging.getLogger(__name__)
 # Omitir logs de SQLAlchemy
 #logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
-app = FastAPI()
-
-# Middleware para registrar solicitudes y respuestas
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    body = await request.body()
-    logger.info(f"Request: {request.method} {request.url} Body: {body.decode('utf-8') if body else 'No Body'}")
-    response = await call_next(request)
-    logger.info(f"Response: {response.status_code}")
-    return response
-
-# Crea la base de datos y las tablas al iniciar la aplicación
+# Crea la base de datos, las tablas y los índices que falten al iniciar la aplicación
 @asynccontextmanager
-async def on_startup():
+async def lifespan(app: FastAPI):
     create_db_and_tables()
+    yield
+
+app = FastAPI(lifespan=lifespan)
+
+# Middleware para registrar solicitudes y respuestas.
+# Solo captura los primeros bytes del cuerpo mientras pasa, sin leerlo entero.
+app.add_middleware(RequestLoggingMiddleware, max_body_bytes=1024, sample_rate=1.0)
+
+# Comprime con zstd, brotli o gzip las respuestas JSON de más de 500 bytes (por ejemplo /api/entries)
+app.add_middleware(CompressionMiddleware, minimum_size=500)
 
 @app.get("/")
 def read_root():
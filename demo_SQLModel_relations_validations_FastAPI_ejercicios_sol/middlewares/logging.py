@@ -0,0 +1,76 @@
+import logging
+import random
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Content types whose body is worth logging; anything else (images, uploads...) is skipped
+TEXT_CONTENT_TYPES = ("text/", "application/json", "application/x-www-form-urlencoded", "application/xml")
+
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware that logs every request and its response status.
+
+    The request body is peeked at as the application reads it, without consuming or
+    buffering it: only the first `max_body_bytes` are kept. Logging can be sampled with
+    `sample_rate` (0.0 - 1.0) and per route prefix with `route_sample_rates`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_bytes: int = 1024,
+        sample_rate: float = 1.0,
+        route_sample_rates: dict = None,
+    ):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.sample_rate = sample_rate
+        # Longest prefix first so the most specific route wins
+        self.route_sample_rates = sorted((route_sample_rates or {}).items(), key=lambda item: -len(item[0]))
+
+    def _should_log(self, path: str) -> bool:
+        rate = next((rate for prefix, rate in self.route_sample_rates if path.startswith(prefix)), self.sample_rate)
+        return rate >= 1.0 or random.random() < rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._should_log(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        captured = bytearray()
+        truncated = False
+        status_code = None
+        content_type = Headers(scope=scope).get("content-type", "")
+        capture_body = self.max_body_bytes > 0 and content_type.startswith(TEXT_CONTENT_TYPES)
+
+        async def peek_receive() -> Message:
+            nonlocal truncated
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                room = self.max_body_bytes - len(captured)
+                if room > 0:
+                    captured.extend(chunk[:room])
+                if len(chunk) > room:
+                    truncated = True
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, peek_receive if capture_body else receive, send_wrapper)
+        finally:
+            request = Request(scope)
+            if captured:
+                body = captured.decode("utf-8", errors="replace") + (" ...(truncated)" if truncated else "")
+            else:
+                body = "No Body"
+            logger.info(f"Request: {request.method} {request.url} Body: {body}")
+            logger.info(f"Response: {status_code}")
@@ -1,18 +1,29 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
 from typing import List, Optional
 from pydantic import EmailStr
-from datetime import datetime, timezone
+from datetime import datetime
+from models.timestamps import utc_now
 
 class AuthorBase(SQLModel):
     name: str = Field(index=True)  # Ensure name is indexed for faster lookups
     email: EmailStr = Field(index=True, unique=True)  # Use EmailStr for email validation
 
 class Author(AuthorBase, table=True):
+    # Índices compuestos para la paginación por cursor de GET /api/authors (filtro is_deleted + orden)
+    __table_args__ = (
+        Index("ix_author_live_id", "is_deleted", "id"),
+        Index("ix_author_live_name_id", "is_deleted", "name", "id"),
+        Index("ix_author_live_created_at_id", "is_deleted", "created_at", "id"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     entries: List["Entry"] = Relationship(back_populates="author")  # type: ignore
     is_deleted: bool = Field(default=False)  # Field to mark soft deletion
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # Automatically set creation timestamp
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # Automatically update timestamp
+    created_at: datetime = Field(default_factory=utc_now)  # Automatically set creation timestamp
+    updated_at: datetime = Field(default_factory=utc_now)  # Automatically update timestamp
 
 class AuthorCreate(AuthorBase):
     pass  # Excluir el campo id para la creación de un nuevo autor
+
+class AuthorPage(SQLModel):
+    items: List[Author]
+    next_cursor: Optional[str] = None  # None en la última página
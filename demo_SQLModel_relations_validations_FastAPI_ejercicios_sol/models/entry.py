@@ -1,22 +1,29 @@
-from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional
+from sqlmodel import SQLModel, Field, Relationship, Index
+from typing import List, Optional
 from models.author import Author
 from models.category import Category
-from datetime import datetime, timezone
+from datetime import datetime
+from models.timestamps import utc_now
 
 class EntryBase(SQLModel):
     title: str = Field(index=True, unique=True)  # Ensure title is indexed for faster lookups
     content: str
 
 class Entry(EntryBase, table=True):
+    # Índices compuestos para la paginación por cursor de GET /api/entries (filtro is_deleted + orden)
+    __table_args__ = (
+        Index("ix_entry_live_id", "is_deleted", "id"),
+        Index("ix_entry_live_title_id", "is_deleted", "title", "id"),
+        Index("ix_entry_live_created_at_id", "is_deleted", "created_at", "id"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     author_id: int = Field(foreign_key="author.id")
     author: Optional["Author"] = Relationship(back_populates="entries") 
     category_id: Optional[int] = Field(default=None, foreign_key="category.id")
     category: Optional["Category"] = Relationship(back_populates="entries")
     is_deleted: bool = Field(default=False)  # Field to mark soft deletion
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # Automatically set creation timestamp
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # Automatically update timestamp
+    created_at: datetime = Field(default_factory=utc_now)  # Automatically set creation timestamp
+    updated_at: datetime = Field(default_factory=utc_now)  # Automatically update timestamp
 
 class EntryCreate(EntryBase):
     author_name: str 
@@ -24,3 +31,17 @@ class EntryCreate(EntryBase):
 class EntryRead(EntryBase):
     id: int
     author: Author
+
+class EntryPage(SQLModel):
+    items: List[EntryRead]
+    next_cursor: Optional[str] = None  # None en la última página
+
+class EntrySearchResult(EntryRead):
+    rank: float  # Relevancia: cuanto mayor, mejor
+    title_highlight: str  # Título con los términos encontrados entre <mark></mark> (HTML escapado)
+    snippet: str  # Fragmento del contenido con los términos resaltados
+
+class EntrySearchPage(SQLModel):
+    items: List[EntrySearchResult]
+    page: int
+    next_page: Optional[int] = None  # None en la última página
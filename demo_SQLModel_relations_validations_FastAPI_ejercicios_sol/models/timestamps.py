@@ -0,0 +1,8 @@
+from datetime import datetime, timezone
+
+def utc_now() -> datetime:
+    """
+    Hora actual en UTC sin zona horaria. Las columnas created_at / updated_at son
+    TIMESTAMP WITHOUT TIME ZONE, y asyncpg rechaza guardar en ellas un datetime con zona.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Query
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional
 from db.database import get_session
-from models.author import Author, AuthorCreate
+from models.author import Author, AuthorCreate, AuthorPage
 from crud.author import (
     create_author,
     get_authors,
@@ -16,7 +17,7 @@ from crud.author import (
 router = APIRouter()
 
 @router.post("/", response_model=Author, description="Create a new author with a unique email.")
-def create(author: AuthorCreate, session: Session = Depends(get_session)):
+async def create(author: AuthorCreate, session: AsyncSession = Depends(get_session)):
     """
     Create a new author.
     - **name**: The name of the author.
@@ -26,36 +27,41 @@ def create(author: AuthorCreate, session: Session = Depends(get_session)):
         if not author.email.strip():
             raise HTTPException(status_code=400, detail="Email cannot be empty.")
         author_data = Author(**author.model_dump())
-        return create_author(session, author_data)
+        return await create_author(session, author_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
-@router.get("/", response_model=list[Author], description="Retrieve all authors with pagination.")
-def read_all(
-    limit: int = Query(10, ge=1, description="The maximum number of authors to return."),
-    offset: int = Query(0, ge=0, description="The number of authors to skip before starting to return results."),
-    session: Session = Depends(get_session)
+@router.get("/", response_model=AuthorPage, description="Retrieve all authors with cursor-based pagination.")
+async def read_all(
+    limit: int = Query(10, ge=1, le=100, description="The maximum number of authors to return."),
+    cursor: Optional[str] = Query(None, description="The `next_cursor` returned by the previous page."),
+    order_by: str = Query("id", pattern="^(id|name|created_at)$", description="The field to order the results by."),
+    session: AsyncSession = Depends(get_session)
 ):
     """
-    Retrieve all authors with pagination.
+    Retrieve all authors with cursor-based pagination.
     - **limit**: The maximum number of authors to return.
-    - **offset**: The number of authors to skip before starting to return results.
+    - **cursor**: Optional. The `next_cursor` of the previous page; omit it to get the first page.
+    - **order_by**: Optional. The field to order the results by (`id`, `name` or `created_at`).
     """
     try:
-        return get_authors(session, limit=limit, offset=offset)
+        authors, next_cursor = await get_authors(session, limit=limit, cursor=cursor, order_by=order_by)
+        return AuthorPage(items=authors, next_cursor=next_cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.get("/{author_id}", response_model=Author, description="Retrieve an author by their unique ID.")
-def read(author_id: int, session: Session = Depends(get_session)):
+async def read(author_id: int, session: AsyncSession = Depends(get_session)):
     """
     Retrieve an author by ID.
     - **author_id**: The unique identifier of the author.
     """
     try:
-        author = get_author_by_id(session, author_id)
+        author = await get_author_by_id(session, author_id)
         if not author:
             raise HTTPException(status_code=404, detail=f"Author with ID {author_id} not found")
         return author
@@ -63,13 +69,13 @@ def read(author_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.get("/name/{name}", response_model=Author, description="Retrieve an author by their name.")
-def read_by_name(name: str, session: Session = Depends(get_session)):
+async def read_by_name(name: str, session: AsyncSession = Depends(get_session)):
     """
     Retrieve an author by name.
     - **name**: The name of the author.
     """
     try:
-        author = get_author_by_name(session, name)
+        author = await get_author_by_name(session, name)
         if not author:
             raise HTTPException(status_code=404, detail=f"Author with name '{name}' not found")
         return author
@@ -77,7 +83,7 @@ def read_by_name(name: str, session: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.put("/{author_id}", response_model=Author, description="Update an author's details by their ID.")
-def update(
+async def update(
     author_id: int,
     author_data: dict = Body(
         ...,
@@ -86,7 +92,7 @@ def update(
             "email": "updated_email@example.com"
         }
     ),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Update an author's details.
@@ -99,7 +105,7 @@ def update(
             raise HTTPException(status_code=400, detail="Updating 'id' is not allowed.")
         if "email" in author_data and not author_data["email"].strip():
             raise HTTPException(status_code=400, detail="Email cannot be empty.")
-        updated_author = update_author(session, author_id, author_data)
+        updated_author = await update_author(session, author_id, author_data)
         if not updated_author:
             raise HTTPException(status_code=404, detail=f"Author with ID {author_id} not found")
         return updated_author
@@ -107,7 +113,7 @@ def update(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.put("/name/{name}", response_model=Author, description="Update an author's details by their name.")
-def update_by_name(
+async def update_by_name(
     name: str,
     author_data: dict = Body(
         ...,
@@ -116,7 +122,7 @@ def update_by_name(
             "email": "updated_email@example.com"
         }
     ),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Update an author's details by name.
@@ -128,7 +134,7 @@ def update_by_name(
             raise HTTPException(status_code=400, detail="Updating 'id' is not allowed.")
         if "email" in author_data and not author_data["email"].strip():
             raise HTTPException(status_code=400, detail="Email cannot be empty.")
-        updated_author = update_author_by_name(session, name, author_data)
+        updated_author = await update_author_by_name(session, name, author_data)
         if not updated_author:
             raise HTTPException(status_code=404, detail=f"Author with name '{name}' not found")
         return updated_author
@@ -138,13 +144,13 @@ def update_by_name(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.delete("/{author_id}", response_model=Author, description="Soft delete an author by their ID.")
-def delete(author_id: int, session: Session = Depends(get_session)):
+async def delete(author_id: int, session: AsyncSession = Depends(get_session)):
     """
     Soft delete an author.
     - **author_id**: The unique identifier of the author.
     """
     try:
-        deleted_author = delete_author(session, author_id)
+        deleted_author = await delete_author(session, author_id)
         if not deleted_author:
             raise HTTPException(status_code=404, detail=f"Author with ID {author_id} not found")
         return deleted_author
@@ -152,13 +158,13 @@ def delete(author_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.delete("/name/{name}", response_model=Author, description="Soft delete an author by their name.")
-def delete_by_name(name: str, session: Session = Depends(get_session)):
+async def delete_by_name(name: str, session: AsyncSession = Depends(get_session)):
     """
     Soft delete an author by name.
     - **name**: The name of the author to delete.
     """
     try:
-        deleted_author = delete_author_by_name(session, name)
+        deleted_author = await delete_author_by_name(session, name)
         if not deleted_author:
             raise HTTPException(status_code=404, detail=f"Author with name '{name}' not found")
         return deleted_author
@@ -0,0 +1,40 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+
+import db.database as database
+from db.query_counter import assert_max_queries
+from main import app
+from models.author import Author
+from models.entry import Entry
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Base de datos nueva en tmp_path: el test no toca test.db
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(database, "engine", create_engine(f"sqlite:///{path}"))
+    monkeypatch.setattr(database, "async_engine", create_async_engine(f"sqlite+aiosqlite:///{path}"))
+    database.create_db_and_tables()
+    with Session(database.engine) as session:
+        authors = [Author(name=f"Autor {i}", email=f"autor{i}@example.com") for i in range(3)]
+        session.add_all(Entry(title=f"Entrada {i}", content="Contenido", author=authors[i % 3]) for i in range(15))
+        session.commit()
+    with TestClient(app) as client:
+        yield client
+
+@pytest.mark.parametrize("order_by", ["id", "title", "created_at"])
+def test_list_entries_loads_authors_in_the_same_query(client, order_by):
+    # Una consulta por entrada para cargar su autor (N+1), o un COUNT aparte para la paginación, harían fallar el test
+    with assert_max_queries(database.async_engine, 1):
+        response = client.get("/api/entries/", params={"order_by": order_by})
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page["items"]) == 10
+    assert page["next_cursor"] is not None
+    assert {entry["author"]["name"] for entry in page["items"]} == {"Autor 0", "Autor 1", "Autor 2"}
+
+    with assert_max_queries(database.async_engine, 1):
+        response = client.get("/api/entries/", params={"order_by": order_by, "cursor": page["next_cursor"]})
+    assert len(response.json()["items"]) == 5
+    assert response.json()["next_cursor"] is None
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
+from uuid import uuid4
 from jose import jwt, JWTError
+from auth.revocation import deny_list
 
 SECRET_KEY = "your_secret_key"
 ALGORITHM = "HS256"
@@ -8,12 +10,24 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid4().hex})  # jti identifica el token para poder revocarlo
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def verify_access_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    # Comprobación en memoria: no añade ninguna consulta a la base de datos
+    jti = payload.get("jti")
+    if jti and deny_list.is_revoked(jti):
+        return None
+    return payload
+
+def revoke_token(payload: dict):
+    """Revoca el token hasta su expiración. Los tokens sin jti no se pueden revocar."""
+    jti = payload.get("jti")
+    if not jti:
+        return False
+    deny_list.revoke(jti, payload["exp"])
+    return True
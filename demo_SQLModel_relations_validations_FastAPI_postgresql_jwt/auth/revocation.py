@@ -0,0 +1,76 @@
+import hashlib
+import math
+import time
+from threading import Lock
+
+class BloomFilter:
+    """
+    Filtro de Bloom: responde "seguro que no está" o "puede que esté".
+    Ocupa unos pocos bits por elemento, así que cabe en memoria aunque haya muchos tokens revocados.
+    """
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.01):
+        expected_items = max(expected_items, 1)
+        self.size = max(8, int(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.size / expected_items * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Doble hashing: k posiciones a partir de un único digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str):
+        return all(self._bits[position >> 3] >> (position & 7) & 1 for position in self._positions(key))
+
+class TokenDenyList:
+    """
+    Lista de tokens revocados (por su claim `jti`) hasta su `exp`.
+    La comprobación consulta primero el filtro de Bloom y solo mira el diccionario exacto
+    si hay un posible acierto. Las entradas caducadas se purgan periódicamente y el filtro
+    se reconstruye, de modo que la memoria depende solo de los tokens revocados aún vigentes.
+    """
+
+    def __init__(self, expected_items: int = 10_000, false_positive_rate: float = 0.01, purge_interval: int = 60):
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.purge_interval = purge_interval
+        self._revoked = {}  # jti -> exp (timestamp)
+        self._bloom = BloomFilter(expected_items, false_positive_rate)
+        self._next_purge = time.time() + purge_interval
+        self._lock = Lock()
+
+    def _purge(self, now: float):
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        bloom = BloomFilter(max(self.expected_items, 2 * len(self._revoked)), self.false_positive_rate)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._next_purge = now + self.purge_interval
+
+    def revoke(self, jti: str, exp: float):
+        now = time.time()
+        if exp <= now:
+            return  # Ya ha caducado: no hace falta recordarlo
+        with self._lock:
+            if now >= self._next_purge or len(self._revoked) >= 2 * self.expected_items:
+                self._purge(now)
+            self._revoked[jti] = exp
+            self._bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        exp = self._revoked.get(jti)
+        return exp is not None and exp > time.time()
+
+    def __len__(self):
+        return len(self._revoked)
+
+deny_list = TokenDenyList()
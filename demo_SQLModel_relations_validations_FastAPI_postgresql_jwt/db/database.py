@@ -1,5 +1,7 @@
 import os
-from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Construct DATABASE_URL from individual environment variables
 DB_USER = os.getenv("DB_USER", "postgres")
@@ -9,15 +11,29 @@ DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME", "postgres")
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Misma base de datos a través de asyncpg: la usan las rutas de la API
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Motor síncrono (psycopg2): solo para scripts (seeder.py) y para crear o borrar las tablas
 engine = create_engine(DATABASE_URL, echo=True)
 
+# Motor asíncrono: mientras una petición espera a PostgreSQL no ocupa ningún hilo del threadpool
+# de FastAPI, así que la concurrencia la limita el pool de conexiones (pool_size + max_overflow)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=True,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    pool_pre_ping=True,
+)
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 def drop_db_and_tables():
     SQLModel.metadata.drop_all(engine)
 
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+async def get_session():
+    # expire_on_commit=False: tras el commit los objetos se serializan sin volver a consultar la base de datos
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
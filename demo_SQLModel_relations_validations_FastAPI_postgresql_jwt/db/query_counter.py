@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+
+class QueryCounter:
+    """Sentencias SQL ejecutadas mientras el contador está activo."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@contextmanager
+def count_queries(engine):
+    """
+    Cuenta las sentencias SQL que se ejecutan dentro del bloque:
+
+        with count_queries(engine) as counter:
+            client.get("/api/entries/")
+        print(counter.count, counter.statements)
+    """
+    counter = QueryCounter()
+    # Los eventos de un AsyncEngine se registran en su motor síncrono subyacente
+    engine = getattr(engine, "sync_engine", engine)
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+@contextmanager
+def assert_max_queries(engine, expected: int):
+    """
+    Falla (AssertionError) si el bloque ejecuta más de `expected` sentencias SQL.
+    Sirve para detectar regresiones N+1 en los tests:
+
+        with assert_max_queries(engine, 1):
+            client.get("/api/entries/")
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > expected:
+        listing = "\n".join(f"  {i}. {statement}" for i, statement in enumerate(counter.statements, 1))
+        raise AssertionError(f"Expected at most {expected} SQL statements, got {counter.count}:\n{listing}")
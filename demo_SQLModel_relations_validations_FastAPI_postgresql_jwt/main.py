@@ -4,6 +4,7 @@ from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from db.database import create_db_and_tables
 from routes import author, entry, auth
+from middlewares.compression import CompressionMiddleware
 from auth.jwt import verify_access_token
 import uvicorn
 from dotenv import load_dotenv
@@ -13,6 +14,9 @@ load_dotenv()
 
 app = FastAPI()
 
+# Comprime con zstd, brotli o gzip las respuestas JSON de más de 500 bytes (por ejemplo /api/entries)
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
-from auth.jwt import create_access_token
+from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from auth.jwt import create_access_token, verify_access_token, revoke_token
+from auth.dependencies import get_current_user
 from auth.hashing import hash_password, verify_password
 from db.database import get_session
 from models.user import User, UserCreate, UserRead
@@ -8,21 +11,41 @@ from models.user import User, UserCreate, UserRead
 router = APIRouter()
 
 @router.post("/register", response_model=UserRead)
-def register(user: UserCreate, session: Session = Depends(get_session)):
-    existing_user = session.query(User).filter(User.username == user.username).first()
+async def register(user: UserCreate, session: AsyncSession = Depends(get_session)):
+    existing_user = (await session.exec(select(User).where(User.username == user.username))).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already exists")
-    hashed_password = hash_password(user.password)
+    # bcrypt es costoso en CPU: se ejecuta en el threadpool para no bloquear el bucle de eventos
+    hashed_password = await run_in_threadpool(hash_password, user.password)
     new_user = User(username=user.username, email=user.email, hashed_password=hashed_password)
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
+    await session.refresh(new_user)
     return new_user
 
 @router.post("/login")
-def login(username: str, password: str, session: Session = Depends(get_session)):
-    user = session.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.hashed_password):
+async def login(username: str, password: str, session: AsyncSession = Depends(get_session)):
+    user = (await session.exec(select(User).where(User.username == username))).first()
+    if not user or not await run_in_threadpool(verify_password, password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     token = create_access_token({"sub": user.username})
     return {"access_token": token, "token_type": "bearer"}
+
+@router.post("/logout")
+def logout(current_user: dict = Depends(get_current_user)):
+    """Revoca el token con el que se hace la petición."""
+    if not revoke_token(current_user):
+        raise HTTPException(status_code=400, detail="Token cannot be revoked")
+    return {"message": "Logged out successfully"}
+
+@router.post("/revoke")
+def revoke(token: str = Body(..., embed=True), current_user: dict = Depends(get_current_user)):
+    """Revoca otro token (por ejemplo, de una sesión comprometida) hasta su expiración."""
+    payload = verify_access_token(token)
+    if not payload:
+        raise HTTPException(status_code=400, detail="Invalid, expired or already revoked token")
+    if payload.get("sub") != current_user.get("sub"):
+        raise HTTPException(status_code=403, detail="You can only revoke your own tokens")
+    if not revoke_token(payload):
+        raise HTTPException(status_code=400, detail="Token cannot be revoked")
+    return {"message": "Token revoked successfully"}
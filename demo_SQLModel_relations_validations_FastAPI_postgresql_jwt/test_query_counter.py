@@ -0,0 +1,44 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, delete
+
+from db.database import async_engine, create_db_and_tables, engine
+from db.query_counter import assert_max_queries
+from main import app
+from models.author import Author
+from models.entry import Entry
+
+@pytest.fixture
+def client():
+    # Usa la base de datos de DB_HOST/DB_NAME...: sus filas se crean con un prefijo único y se borran al terminar
+    try:
+        create_db_and_tables()
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL no disponible: {e.orig}")
+    prefix = f"test-{uuid.uuid4().hex[:8]}"
+    with Session(engine) as session:
+        authors = [Author(name=f"{prefix} autor {i}", email=f"{prefix}-{i}@example.com") for i in range(3)]
+        session.add_all(Entry(title=f"{prefix} entrada {i}", content="Contenido", author=authors[i % 3]) for i in range(10))
+        session.commit()
+        author_ids = [author.id for author in authors]
+    try:
+        with TestClient(app) as client:
+            client.prefix = prefix
+            yield client
+    finally:
+        with Session(engine) as session:
+            session.exec(delete(Entry).where(Entry.author_id.in_(author_ids)))
+            session.exec(delete(Author).where(Author.id.in_(author_ids)))
+            session.commit()
+
+def test_list_entries_loads_authors_in_the_same_query(client):
+    # Una consulta por entrada para cargar su autor (N+1) haría fallar el test
+    with assert_max_queries(async_engine, 1):
+        response = client.get("/api/entries/")
+    assert response.status_code == 200
+    entries = [entry for entry in response.json() if entry["title"].startswith(client.prefix)]
+    assert len(entries) == 10
+    assert all(entry["author"]["name"].startswith(client.prefix) for entry in entries)